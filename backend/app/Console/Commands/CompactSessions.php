@@ -0,0 +1,172 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\QAEntry;
+use App\Models\SessionArchive;
+use App\Models\TranscriptChunk;
+use Illuminate\Console\Command;
+use Illuminate\Support\Carbon;
+use Illuminate\Support\Facades\DB;
+
+class CompactSessions extends Command
+{
+    protected $signature = 'sessions:compact
+        {--idle= : Minutes without new transcript chunks before a session counts as finished (default TRANSCRIPT_COMPACT_IDLE_MINUTES or 120)}
+        {--qa-retention-days= : Archive or prune qa_entries older than this many days; 0 keeps everything (default QA_RETENTION_DAYS or 0)}
+        {--qa-mode= : "archive" (compress into session_archives) or "prune" (delete) (default QA_RETENTION_MODE or archive)}
+        {--vacuum : Run VACUUM afterwards to return freed pages to the filesystem (SQLite)}
+        {--dry-run : Report what would be compacted without writing}';
+
+    protected $description = 'Merge finished sessions\' transcript chunks into compressed archives and apply the Q&A retention policy';
+
+    public function handle(): int
+    {
+        $idle = (int) ($this->option('idle') ?? env('TRANSCRIPT_COMPACT_IDLE_MINUTES', 120));
+        $retentionDays = (int) ($this->option('qa-retention-days') ?? env('QA_RETENTION_DAYS', 0));
+        $qaMode = (string) ($this->option('qa-mode') ?? env('QA_RETENTION_MODE', 'archive'));
+        $dryRun = (bool) $this->option('dry-run');
+
+        if (!in_array($qaMode, ['archive', 'prune'], true)) {
+            $this->error("Unknown --qa-mode '{$qaMode}' (expected archive or prune)");
+            return self::FAILURE;
+        }
+
+        $sizeBefore = $this->databaseSize();
+
+        // Transcripts: sessions whose newest chunk is older than the idle cutoff
+        $cutoff = Carbon::now()->subMinutes(max(0, $idle));
+        $finished = TranscriptChunk::query()
+            ->select('session_id')
+            ->groupBy('session_id')
+            ->havingRaw('MAX(created_at) < ?', [$cutoff])
+            ->pluck('session_id');
+
+        $chunks = 0;
+        foreach ($finished as $sid) {
+            $chunks += $this->archiveSession(
+                (string) $sid,
+                SessionArchive::KIND_TRANSCRIPT,
+                TranscriptChunk::where('session_id', $sid),
+                fn (TranscriptChunk $c) => [
+                    'text' => $c->text,
+                    'source' => $c->source,
+                    'created_at' => $c->created_at?->toIso8601String(),
+                ],
+                $dryRun
+            );
+        }
+        $this->info(sprintf('Transcripts: %d chunk(s) from %d finished session(s) %s', $chunks, $finished->count(), $dryRun ? 'would be archived' : 'archived'));
+
+        // Q&A retention
+        if ($retentionDays > 0) {
+            $qaCutoff = Carbon::now()->subDays($retentionDays);
+            if ($qaMode === 'prune') {
+                $old = QAEntry::where('created_at', '<', $qaCutoff);
+                $n = $dryRun ? $old->count() : $old->delete();
+                $this->info(sprintf('Q&A: %d entr(ies) older than %d day(s) %s', $n, $retentionDays, $dryRun ? 'would be pruned' : 'pruned'));
+            } else {
+                $sessions = QAEntry::where('created_at', '<', $qaCutoff)->distinct()->pluck('session_id');
+                $n = 0;
+                foreach ($sessions as $sid) {
+                    $n += $this->archiveSession(
+                        (string) $sid,
+                        SessionArchive::KIND_QA,
+                        QAEntry::where('session_id', $sid)->where('created_at', '<', $qaCutoff),
+                        fn (QAEntry $q) => array_merge(
+                            $q->only(['persona_id', 'question', 'ai_answer', 'final_answer', 'model', 'route_reason', 'complexity', 'ttfb_ms', 'latency_ms', 'draft_answer', 'draft_model', 'draft_ms', 'refined_ms', 'refined_in_time']),
+                            ['created_at' => $q->created_at?->toIso8601String()]
+                        ),
+                        $dryRun
+                    );
+                }
+                $this->info(sprintf('Q&A: %d entr(ies) older than %d day(s) %s', $n, $retentionDays, $dryRun ? 'would be archived' : 'archived'));
+            }
+        }
+
+        if (!$dryRun && DB::getDriverName() === 'sqlite') {
+            // Optionally reclaim free pages, then fold the WAL back into the main file
+            if ($this->option('vacuum')) {
+                DB::statement('VACUUM');
+            }
+            DB::statement('PRAGMA optimize');
+            DB::statement('PRAGMA wal_checkpoint(TRUNCATE)');
+        }
+
+        $sizeAfter = $this->databaseSize();
+        if ($sizeBefore !== null && $sizeAfter !== null) {
+            $this->info(sprintf('Database size: %s -> %s', $this->formatBytes($sizeBefore), $this->formatBytes($sizeAfter)));
+        }
+
+        return self::SUCCESS;
+    }
+
+    /**
+     * Move the rows matched by $query into a new archive segment for the session and
+     * delete them, in one transaction. Earlier segments are left untouched, so each run
+     * only costs as much as the rows it compacts. Returns the number of rows moved.
+     */
+    private function archiveSession(string $sid, string $kind, $query, callable $map, bool $dryRun): int
+    {
+        if ($dryRun) {
+            return $query->count();
+        }
+
+        return DB::transaction(function () use ($sid, $kind, $query, $map) {
+            $maxId = null;
+            $count = 0;
+            $first = null;
+            $last = null;
+            $rows = (function () use ($query, $map, &$maxId, &$count, &$first, &$last) {
+                foreach ((clone $query)->orderBy('id')->cursor() as $model) {
+                    yield $map($model);
+                    $maxId = $model->id;
+                    $count++;
+                    $first ??= $model->created_at;
+                    $last = $model->created_at;
+                }
+            })();
+            $payload = SessionArchive::encodeRows($rows);
+            if ($maxId === null) {
+                return 0;
+            }
+
+            SessionArchive::create([
+                'session_id' => $sid,
+                'kind' => $kind,
+                'row_count' => $count,
+                'first_at' => $first,
+                'last_at' => $last,
+                'payload' => $payload,
+            ]);
+
+            return (clone $query)->where('id', '<=', $maxId)->delete();
+        });
+    }
+
+    private function databaseSize(): ?int
+    {
+        if (DB::getDriverName() !== 'sqlite') {
+            return null;
+        }
+        $path = (string) DB::connection()->getConfig('database');
+        if ($path === '' || $path === ':memory:' || !is_file($path)) {
+            return null;
+        }
+        clearstatcache();
+        $size = filesize($path);
+        foreach (['-wal', '-shm'] as $suffix) {
+            if (is_file($path . $suffix)) {
+                $size += filesize($path . $suffix);
+            }
+        }
+        return $size;
+    }
+
+    private function formatBytes(int $bytes): string
+    {
+        return $bytes >= 1048576
+            ? number_format($bytes / 1048576, 2) . ' MB'
+            : number_format($bytes / 1024, 1) . ' KB';
+    }
+}
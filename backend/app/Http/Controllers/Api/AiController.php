@@ -5,11 +5,21 @@
 use App\Http\Controllers\Controller;
 use Illuminate\Http\JsonResponse;
 use Illuminate\Http\Request;
+use App\Services\AnswerBankMatcher;
+use App\Services\ConcurrencyGate;
+use App\Services\ModelRouter;
 use App\Services\OpenAIService;
+use App\Services\PersonaCatalog;
+use App\Services\PromptBuilder;
+use App\Services\SingleFlight;
+use App\Jobs\BuildAnswerBank;
 use App\Models\Persona;
 use App\Models\TranscriptChunk;
 use App\Models\QAEntry;
 use App\Models\InterviewInfo;
+use Symfony\Component\HttpFoundation\Response;
+use Symfony\Component\HttpFoundation\StreamedResponse;
+use Symfony\Component\HttpKernel\Exception\TooManyRequestsHttpException;
 
 class AiController extends Controller
 {
@@ -18,27 +28,23 @@ public function health(): JsonResponse
         return response()->json(['status' => 'ok']);
     }
 
-    public function generate(Request $request, OpenAIService $openai): JsonResponse
+    public function generate(Request $request, OpenAIService $openai, PromptBuilder $prompts, AnswerBankMatcher $bank, ModelRouter $router, SingleFlight $flight, ConcurrencyGate $gate, PersonaCatalog $catalog): Response
     {
         $validated = $request->validate([
             'prompt' => ['required', 'string', 'max:20000'],
             'persona_id' => ['nullable', 'integer'],
             'session_id' => ['nullable', 'string', 'max:100'],
             'model' => ['nullable', 'string', 'max:50'],
+            'retry' => ['nullable', 'boolean'],
+            'mode' => ['nullable', 'string', 'in:single,draft_refine'],
         ]);
+        $retry = (bool) ($validated['retry'] ?? false);
+        // ANSWER_MODE only applies to clients that can read the NDJSON stream
+        $mode = (string) ($validated['mode']
+            ?? (str_contains((string) $request->header('Accept'), 'application/x-ndjson') ? env('ANSWER_MODE', 'single') : 'single'));
 
-        $baseSystem = "You are a concise, expert assistant. Prefer short, high-signal responses.";
-        $system = $baseSystem;
-
-        // Persona enrichment
         $personaId = $validated['persona_id'] ?? null;
-        $persona = null;
-        if ($personaId) {
-            $persona = Persona::find($personaId);
-            if ($persona) {
-                $system .= "\n\nPersona instructions:\n" . $persona->system_prompt;
-            }
-        }
+        $persona = $catalog->find($personaId ? (int) $personaId : null);
 
         // Determine session id early for caching and persistence
         $cacheSid = (string) ($validated['session_id'] ?? 'local-dev');
@@ -50,50 +56,267 @@ public function generate(Request $request, OpenAIService $openai): JsonResponse
         } else {
             $query->whereNull('persona_id');
         }
-        $existing = $query->orderByDesc('id')->first();
+        // A retry asks for a fresh (possibly upgraded) answer, so skip cache and bank
+        $existing = $retry ? null : (clone $query)->orderByDesc('id')->first();
         if ($existing) {
             return response()->json([
                 'answer' => (string) $existing->ai_answer,
+                'source' => 'cache',
+                'model' => $existing->model,
             ]);
         }
 
-        // Interview info enrichment
-        $sid = $validated['session_id'] ?? null;
-        if ($sid) {
-            $info = InterviewInfo::where('session_id', $sid)->first();
-            if ($info) {
-                $system .= "\n\nInterview context:";
-                if ($info->company) { $system .= "\nCompany: {$info->company}"; }
-                if ($info->role) { $system .= "\nRole: {$info->role}"; }
-                if ($info->context) {
-                    $limit = (int) env('INTERVIEW_NOTES_SOFT_LIMIT', 10000);
-                    $notes = (string) $info->context;
-                    if (strlen($notes) > $limit) {
-                        $headLen = (int) floor($limit * 0.7);
-                        $tailLen = (int) floor($limit * 0.25);
-                        $head = substr($notes, 0, $headLen);
-                        $tail = substr($notes, -$tailLen);
-                        $notes = $head . "\n[... truncated for speed/context ...]\n" . $tail;
+        // Pre-generated answer bank (built from interview info by BuildAnswerBank)
+        if (!$retry && filter_var(env('ANSWER_BANK_ENABLED', true), FILTER_VALIDATE_BOOLEAN)) {
+            $hit = $bank->match($validated['prompt'], $cacheSid, $persona?->id);
+            if ($hit) {
+                QAEntry::create([
+                    'session_id' => $cacheSid,
+                    'persona_id' => $persona?->id,
+                    'question' => $validated['prompt'],
+                    'ai_answer' => $hit->answer,
+                    'model' => $hit->model,
+                    'route_reason' => 'answer_bank',
+                ]);
+                return response()->json([
+                    'answer' => (string) $hit->answer,
+                    'source' => 'answer_bank',
+                    'model' => $hit->model,
+                    'matched_question' => $hit->question,
+                ]);
+            }
+        }
+
+        // Draft-then-refine: stream a fast draft, then the strong model's answer if it beats the deadline
+        if ($mode === 'draft_refine') {
+            $ticket = null;
+            if ($gate->enabled() && ($ticket = $gate->acquire($cacheSid)) === null) {
+                return $this->busyResponse();
+            }
+            return $this->streamDraftRefine($validated['prompt'], $cacheSid, $persona, $openai, $prompts, $router, $gate, $ticket);
+        }
+
+        // Model routing: "auto" picks by complexity and rolling latency; retry may upgrade
+        $route = $router->route($validated['prompt'], $validated['model'] ?? null, $retry);
+
+        // Single-flight: identical concurrent requests (double-click, clients sharing a
+        // session) wait for one OpenAI call instead of each making their own
+        $flightKey = SingleFlight::key($cacheSid, (string) ($persona?->id ?? ''), $route['model'], $retry ? 'retry' : '', $validated['prompt']);
+        try {
+            [$payload, $shared] = $flight->run($flightKey, function () use ($validated, $persona, $cacheSid, $retry, $query, $route, $openai, $prompts, $router, $gate) {
+                if (!$retry) {
+                    // An earlier leader may have persisted this answer after our cache check
+                    $done = (clone $query)->orderByDesc('id')->first();
+                    if ($done) {
+                        return ['answer' => (string) $done->ai_answer, 'source' => 'cache', 'model' => $done->model];
                     }
-                    $system .= "\nNotes:\n{$notes}";
                 }
-            }
+
+                $ticket = null;
+                if ($gate->enabled()) {
+                    $ticket = $gate->acquire($cacheSid);
+                    if ($ticket === null) {
+                        throw new TooManyRequestsHttpException();
+                    }
+                }
+                try {
+                    return $this->generateLive($validated['prompt'], $cacheSid, $persona, $route, $openai, $prompts, $router);
+                } finally {
+                    if ($ticket !== null) {
+                        $gate->release($ticket);
+                    }
+                }
+            });
+        } catch (TooManyRequestsHttpException $e) {
+            return $this->busyResponse();
         }
 
-        $model = isset($validated['model']) ? (string) $validated['model'] : null;
-        $answer = $openai->generateAnswer($validated['prompt'], null, $system, $model);
+        if ($shared) {
+            $payload['coalesced'] = true;
+        }
+        return response()->json($payload);
+    }
+
+    private function busyResponse(): JsonResponse
+    {
+        return response()->json([
+            'error' => 'busy',
+            'message' => 'Too many answers are being generated; try again shortly.',
+        ], 429, ['Retry-After' => (string) max(1, (int) env('GEN_RETRY_AFTER_SECONDS', 2))]);
+    }
+
+    /**
+     * Run the fast and strong models in parallel and stream NDJSON events:
+     *   {"type":"draft",...}    fast model answer, as soon as it arrives
+     *   {"type":"refined",...}  strong model answer (in time, or late when there is no draft)
+     *   {"type":"done","kept":"draft"|"refined","refined_in_time":bool}
+     * A refined answer that misses REFINE_DEADLINE_MS is still awaited after "done", for at
+     * most REFINE_GRACE_MS more, so qa_entries records it (and its timing) for later analysis.
+     * The concurrency-gate slot is released as soon as "done" is sent.
+     */
+    private function streamDraftRefine(string $prompt, string $sessionId, ?Persona $persona, OpenAIService $openai, PromptBuilder $prompts, ModelRouter $router, ConcurrencyGate $gate, ?string $ticket): StreamedResponse
+    {
+        $info = InterviewInfo::where('session_id', $sessionId)->first();
+        $system = $prompts->system($persona, $info);
+        $draftModel = $router->fastModel();
+        $refinedModel = $router->strongModel();
+        $deadlineMs = max(0, (int) env('REFINE_DEADLINE_MS', 6000));
+        $graceMs = max(0, (int) env('REFINE_GRACE_MS', 10000));
+
+        return response()->stream(function () use ($prompt, $sessionId, $persona, $openai, $router, $gate, $ticket, $system, $draftModel, $refinedModel, $deadlineMs, $graceMs) {
+            // The client stops reading after "done"; keep running to record a late refined answer
+            ignore_user_abort(true);
+            $emit = function (array $event): void {
+                echo json_encode($event) . "\n";
+                if (ob_get_level() > 0) {
+                    ob_flush();
+                }
+                flush();
+            };
 
-        // Persist QA entry
+            $started = microtime(true);
+            $draft = $refined = null;
+            $draftMetrics = $refinedMetrics = [];
+            $draftFailed = $refinedFailed = $refinedLate = false;
+            $kept = null;
+            $shownMs = null;
+            $release = function () use (&$ticket, $gate): void {
+                if ($ticket !== null) {
+                    $gate->release($ticket);
+                    $ticket = null;
+                }
+            };
+
+            $settle = function () use (&$draft, &$refined, &$draftFailed, &$refinedFailed, &$refinedLate, &$kept, &$shownMs, &$refinedMetrics, $emit, $release, $started, $refinedModel): void {
+                if ($kept !== null) {
+                    return;
+                }
+                if ($refined !== null && (!$refinedLate || $draftFailed)) {
+                    $emit(['type' => 'refined', 'answer' => $refined, 'model' => $refinedModel, 'latency_ms' => (int) round($refinedMetrics['latency_ms'])]);
+                    $kept = 'refined';
+                } elseif ($draft !== null && ($refinedLate || $refinedFailed)) {
+                    $kept = 'draft';
+                } elseif ($draftFailed && $refinedFailed) {
+                    $emit(['type' => 'error', 'message' => 'Both model calls failed']);
+                    $kept = 'none';
+                } else {
+                    return;
+                }
+                $shownMs = (int) round((microtime(true) - $started) * 1000);
+                $emit(['type' => 'done', 'kept' => $kept, 'refined_in_time' => $kept === 'refined' && !$refinedLate]);
+                // Waiting for a late refined answer is bookkeeping; don't hold the session's slot for it
+                $release();
+            };
+
+            $deadline = $started + $deadlineMs / 1000;
+            $abandonAt = $deadline + $graceMs / 1000;
+            try {
+                $openai->generateConcurrent([
+                    'draft' => ['prompt' => $prompt, 'system' => $system, 'model' => $draftModel, 'abandon_at' => $abandonAt],
+                    'refined' => ['prompt' => $prompt, 'system' => $system, 'model' => $refinedModel, 'deadline' => $deadline, 'abandon_at' => $abandonAt],
+                ], function (string $key, ?string $answer, array $metrics) use (&$draft, &$refined, &$draftMetrics, &$refinedMetrics, &$draftFailed, &$refinedFailed, &$refinedLate, &$kept, $emit, $settle, $draftModel): void {
+                    if ($key === 'draft') {
+                        $draftMetrics = $metrics;
+                        if ($metrics['ok']) {
+                            $draft = $answer;
+                            if ($kept === null) {
+                                $emit(['type' => 'draft', 'answer' => $answer, 'model' => $draftModel, 'latency_ms' => (int) round($metrics['latency_ms'])]);
+                            }
+                        } else {
+                            $draftFailed = true;
+                        }
+                    } elseif ($answer === null) {
+                        // Deadline passed; the call keeps running and reports again when it completes
+                        $refinedLate = true;
+                    } else {
+                        $refinedMetrics = $metrics;
+                        if ($metrics['ok']) {
+                            $refined = $answer;
+                        } else {
+                            $refinedFailed = true;
+                        }
+                    }
+                    $settle();
+                });
+                if ($kept === null) {
+                    // Neither call answered before REFINE_DEADLINE_MS + REFINE_GRACE_MS
+                    $draftFailed = $refinedFailed = true;
+                    $settle();
+                }
+            } finally {
+                $release();
+            }
+
+            foreach ([$draftMetrics, $refinedMetrics] as $m) {
+                if (!empty($m['ok'])) {
+                    $router->record($m['model'], $m['ttfb_ms'], $m['latency_ms']);
+                }
+            }
+
+            // ai_answer keeps the best answer we got (refined, even if late) for the exact-match cache;
+            // model/ttfb describe the answer the user actually saw and refined_in_time whether that was it
+            $shownMetrics = $kept === 'refined' ? $refinedMetrics : $draftMetrics;
+            QAEntry::create([
+                'session_id' => $sessionId,
+                'persona_id' => $persona?->id,
+                'question' => $prompt,
+                'ai_answer' => $refined ?? $draft ?? '[OpenAI error]',
+                'model' => $kept === 'refined' ? $refinedModel : $draftModel,
+                'route_reason' => 'draft_refine',
+                'ttfb_ms' => isset($shownMetrics['ttfb_ms']) ? (int) round($shownMetrics['ttfb_ms']) : null,
+                'latency_ms' => $shownMs,
+                'draft_answer' => $draft,
+                'draft_model' => $draftModel,
+                'draft_ms' => isset($draftMetrics['latency_ms']) ? (int) round($draftMetrics['latency_ms']) : null,
+                'refined_ms' => $refined !== null ? (int) round($refinedMetrics['latency_ms']) : null,
+                'refined_in_time' => $refined !== null && !$refinedLate,
+            ]);
+        }, 200, [
+            'Content-Type' => 'application/x-ndjson',
+            'Cache-Control' => 'no-cache',
+            'X-Accel-Buffering' => 'no',
+        ]);
+    }
+
+    /**
+     * Call OpenAI for a routed prompt, record latency for the router and persist the QA entry.
+     */
+    private function generateLive(string $prompt, string $sessionId, ?Persona $persona, array $route, OpenAIService $openai, PromptBuilder $prompts, ModelRouter $router): array
+    {
+        // Interview info enrichment
+        $info = InterviewInfo::where('session_id', $sessionId)->first();
+        $system = $prompts->system($persona, $info);
+
+        $answer = $openai->generateAnswer($prompt, null, $system, $route['model']);
+        $metrics = $openai->lastMetrics();
+        if (!empty($metrics['ok'])) {
+            $router->record($route['model'], $metrics['ttfb_ms'], $metrics['latency_ms']);
+        }
+        $ttfbMs = isset($metrics['ttfb_ms']) ? (int) round($metrics['ttfb_ms']) : null;
+        $latencyMs = isset($metrics['latency_ms']) ? (int) round($metrics['latency_ms']) : null;
+
+        // Persist QA entry with the routing decision and its outcome
         QAEntry::create([
-            'session_id' => $cacheSid,
+            'session_id' => $sessionId,
             'persona_id' => $persona?->id,
-            'question' => $validated['prompt'],
+            'question' => $prompt,
             'ai_answer' => $answer,
+            'model' => $route['model'],
+            'route_reason' => $route['reason'],
+            'complexity' => $route['complexity'],
+            'ttfb_ms' => $ttfbMs,
+            'latency_ms' => $latencyMs,
         ]);
 
-        return response()->json([
+        return [
             'answer' => $answer,
-        ]);
+            'source' => 'live',
+            'model' => $route['model'],
+            'route_reason' => $route['reason'],
+            'complexity' => $route['complexity'],
+            'ttfb_ms' => $ttfbMs,
+            'latency_ms' => $latencyMs,
+        ];
     }
 
     public function storeTranscript(Request $request): JsonResponse
@@ -113,9 +336,9 @@ public function storeTranscript(Request $request): JsonResponse
         return response()->json(['ok' => true]);
     }
 
-    public function personas(): JsonResponse
+    public function personas(PersonaCatalog $catalog): JsonResponse
     {
-        $rows = Persona::query()->select(['id', 'name', 'description', 'system_prompt'])->orderBy('id')->get();
+        $rows = $catalog->all()->values();
         return response()->json(['personas' => $rows]);
     }
 
@@ -126,6 +349,7 @@ public function upsertInterviewInfo(Request $request): JsonResponse
             'company' => ['nullable', 'string', 'max:150'],
             'role' => ['nullable', 'string', 'max:150'],
             'context' => ['nullable', 'string'],
+            'persona_id' => ['nullable', 'integer'],
         ]);
 
         $info = InterviewInfo::updateOrCreate(
@@ -137,7 +361,15 @@ public function upsertInterviewInfo(Request $request): JsonResponse
             ]
         );
 
-        return response()->json(['ok' => true, 'interview_info' => $info]);
+        // Refresh the pre-generated answer bank in the background
+        $bankQueued = false;
+        if (filter_var(env('ANSWER_BANK_ENABLED', true), FILTER_VALIDATE_BOOLEAN) && ($info->role || $info->context)) {
+            $personaId = $validated['persona_id'] ?? null;
+            BuildAnswerBank::dispatch($info->session_id, $personaId ? (int) $personaId : null);
+            $bankQueued = true;
+        }
+
+        return response()->json(['ok' => true, 'interview_info' => $info, 'answer_bank_queued' => $bankQueued]);
     }
 
     public function getInterviewInfo(Request $request): JsonResponse
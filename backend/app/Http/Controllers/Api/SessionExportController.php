@@ -0,0 +1,299 @@
+<?php
+
+namespace App\Http\Controllers\Api;
+
+use App\Http\Controllers\Controller;
+use App\Models\InterviewInfo;
+use App\Models\QAEntry;
+use App\Models\SessionArchive;
+use App\Models\TranscriptChunk;
+use Illuminate\Database\Eloquent\Builder;
+use Illuminate\Http\JsonResponse;
+use Illuminate\Http\Request;
+use Illuminate\Support\Arr;
+use Illuminate\Support\Carbon;
+use Illuminate\Support\Facades\DB;
+use Symfony\Component\HttpFoundation\StreamedResponse;
+
+/**
+ * Bulk session export/import as NDJSON (one {"type": ..., ...} object per line).
+ *
+ * Exports walk the tables with lazyById() and write lines to the response as they go,
+ * optionally through an incremental gzip stream, so memory stays flat whatever the
+ * session size. Imports read the request body line by line and insert in batches.
+ */
+class SessionExportController extends Controller
+{
+    private const FORMAT_VERSION = 1;
+    private const EXPORT_CHUNK = 500;
+    private const IMPORT_BATCH = 250;
+
+    /** Exported/importable columns per line type (ids are never carried over). */
+    private const COLUMNS = [
+        'interview_info' => ['session_id', 'company', 'role', 'context', 'created_at', 'updated_at'],
+        'transcript_chunk' => ['session_id', 'text', 'source', 'created_at', 'updated_at'],
+        'qa_entry' => [
+            'session_id', 'persona_id', 'question', 'ai_answer', 'final_answer',
+            'model', 'route_reason', 'complexity', 'ttfb_ms', 'latency_ms',
+            'draft_answer', 'draft_model', 'draft_ms', 'refined_ms', 'refined_in_time',
+            'created_at', 'updated_at',
+        ],
+    ];
+
+    private const TABLES = [
+        'interview_info' => 'interview_infos',
+        'transcript_chunk' => 'transcript_chunks',
+        'qa_entry' => 'qa_entries',
+    ];
+
+    /** Columns that must be present for a row to be importable. */
+    private const REQUIRED = [
+        'interview_info' => ['session_id'],
+        'transcript_chunk' => ['session_id', 'text'],
+        'qa_entry' => ['session_id', 'question', 'ai_answer'],
+    ];
+
+    public function export(Request $request, string $sessionId): StreamedResponse
+    {
+        return $this->stream($request, 'session-' . preg_replace('/[^A-Za-z0-9._-]/', '_', $sessionId), $sessionId);
+    }
+
+    public function exportAll(Request $request): StreamedResponse
+    {
+        return $this->stream($request, 'sessions', null);
+    }
+
+    public function import(Request $request): JsonResponse
+    {
+        $validated = $request->validate([
+            'session_id' => ['nullable', 'string', 'max:100'],
+            'mode' => ['nullable', 'string', 'in:append,replace'],
+        ]);
+        $target = $validated['session_id'] ?? null;
+        $replace = ($validated['mode'] ?? 'append') === 'replace';
+        set_time_limit(0);
+
+        $in = $request->getContent(true);
+        $encoding = strtolower((string) $request->header('Content-Encoding'));
+        $type = strtolower((string) $request->header('Content-Type'));
+        if ($encoding === 'gzip' || str_contains($type, 'gzip')) {
+            // window 31 = gzip framing
+            stream_filter_append($in, 'zlib.inflate', STREAM_FILTER_READ, ['window' => 31]);
+        }
+
+        $counts = array_fill_keys(array_keys(self::COLUMNS), 0);
+        $batches = ['transcript_chunk' => [], 'qa_entry' => []];
+        $sessions = [];
+        $skipped = 0;
+
+        while (($line = fgets($in)) !== false) {
+            $line = trim($line);
+            if ($line === '') {
+                continue;
+            }
+            $row = json_decode($line, true);
+            $kind = is_array($row) ? ($row['type'] ?? null) : null;
+            if (!is_string($kind) || !isset(self::COLUMNS[$kind])) {
+                if ($kind !== 'meta') {
+                    $skipped++;
+                }
+                continue;
+            }
+
+            $data = array_merge(array_fill_keys(self::COLUMNS[$kind], null), Arr::only($row, self::COLUMNS[$kind]));
+            if ($target) {
+                $data['session_id'] = $target;
+            }
+            if (in_array(null, Arr::only($data, self::REQUIRED[$kind]), true)) {
+                $skipped++;
+                continue;
+            }
+            $data['created_at'] = $this->timestamp($data['created_at']);
+            $data['updated_at'] = $this->timestamp($data['updated_at']) ?? $data['created_at'];
+
+            $sid = (string) $data['session_id'];
+            if (!isset($sessions[$sid])) {
+                $sessions[$sid] = true;
+                if ($replace) {
+                    $this->clearSession($sid);
+                }
+            }
+
+            if ($kind === 'interview_info') {
+                InterviewInfo::updateOrCreate(['session_id' => $sid], Arr::except($data, ['session_id']));
+                $counts[$kind]++;
+                continue;
+            }
+            $batches[$kind][] = $data;
+            if (count($batches[$kind]) >= self::IMPORT_BATCH) {
+                $counts[$kind] += $this->insertBatch($kind, $batches[$kind]);
+                $batches[$kind] = [];
+            }
+        }
+        foreach ($batches as $kind => $rows) {
+            $counts[$kind] += $this->insertBatch($kind, $rows);
+        }
+
+        return response()->json([
+            'ok' => true,
+            'sessions' => count($sessions),
+            'imported' => $counts,
+            'skipped' => $skipped,
+        ]);
+    }
+
+    private function stream(Request $request, string $name, ?string $sessionId): StreamedResponse
+    {
+        $validated = $request->validate([
+            'from' => ['nullable', 'date'],
+            'to' => ['nullable', 'date'],
+            'source' => ['nullable', 'string', 'max:50'],
+            'include' => ['nullable', 'string', 'max:100'],
+            'gzip' => ['nullable', 'boolean'],
+        ]);
+        $from = isset($validated['from']) ? Carbon::parse($validated['from']) : null;
+        $to = isset($validated['to']) ? Carbon::parse($validated['to']) : null;
+        $source = $validated['source'] ?? null;
+        $include = array_map('trim', explode(',', (string) ($validated['include'] ?? 'info,transcripts,qa,archives')));
+        $gzip = (bool) ($validated['gzip'] ?? false);
+
+        $filename = $name . '-' . now()->format('Ymd-His') . ($gzip ? '.ndjson.gz' : '.ndjson');
+        $headers = [
+            'Content-Type' => $gzip ? 'application/gzip' : 'application/x-ndjson',
+            'Content-Disposition' => 'attachment; filename="' . $filename . '"',
+            'Cache-Control' => 'no-cache',
+            'X-Accel-Buffering' => 'no',
+        ];
+
+        return response()->stream(function () use ($sessionId, $from, $to, $source, $include, $gzip) {
+            set_time_limit(0);
+            $deflate = $gzip ? deflate_init(ZLIB_ENCODING_GZIP, ['level' => 6]) : null;
+            $buffer = '';
+            $pending = 0;
+
+            $flush = function (bool $final = false) use (&$buffer, &$pending, $deflate): void {
+                $out = $deflate ? deflate_add($deflate, $buffer, $final ? ZLIB_FINISH : ZLIB_SYNC_FLUSH) : $buffer;
+                $buffer = '';
+                $pending = 0;
+                if ($out !== '') {
+                    echo $out;
+                    if (ob_get_level() > 0) {
+                        ob_flush();
+                    }
+                    flush();
+                }
+            };
+            $emit = function (string $type, array $row) use (&$buffer, &$pending, $flush): void {
+                $buffer .= json_encode(['type' => $type] + $row, JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES) . "\n";
+                if (++$pending >= self::EXPORT_CHUNK) {
+                    $flush();
+                }
+            };
+
+            $emit('meta', [
+                'version' => self::FORMAT_VERSION,
+                'exported_at' => now()->toIso8601String(),
+                'session_id' => $sessionId,
+                'from' => $from?->toIso8601String(),
+                'to' => $to?->toIso8601String(),
+                'source' => $source,
+            ]);
+
+            if (in_array('info', $include, true)) {
+                $query = InterviewInfo::query()->when($sessionId !== null, fn (Builder $q) => $q->where('session_id', $sessionId));
+                foreach ($query->lazyById(self::EXPORT_CHUNK) as $info) {
+                    $emit('interview_info', Arr::only($info->getAttributes(), self::COLUMNS['interview_info']));
+                }
+            }
+
+            if (in_array('transcripts', $include, true)) {
+                $query = $this->scoped(TranscriptChunk::query(), $sessionId, $from, $to)
+                    ->when($source !== null, fn (Builder $q) => $q->where('source', $source));
+                foreach ($query->lazyById(self::EXPORT_CHUNK) as $chunk) {
+                    $emit('transcript_chunk', Arr::only($chunk->getAttributes(), self::COLUMNS['transcript_chunk']));
+                }
+            }
+
+            // Q&A rows have no source, so a source filter leaves them out (live and archived alike)
+            $withQa = in_array('qa', $include, true) && $source === null;
+
+            if ($withQa) {
+                foreach ($this->scoped(QAEntry::query(), $sessionId, $from, $to)->lazyById(self::EXPORT_CHUNK) as $entry) {
+                    $emit('qa_entry', Arr::only($entry->getAttributes(), self::COLUMNS['qa_entry']));
+                }
+            }
+
+            // Rows compacted by sessions:compact, decompressed one archive at a time
+            if (in_array('archives', $include, true)) {
+                $kinds = [];
+                if (in_array('transcripts', $include, true)) {
+                    $kinds[SessionArchive::KIND_TRANSCRIPT] = 'transcript_chunk';
+                }
+                if ($withQa) {
+                    $kinds[SessionArchive::KIND_QA] = 'qa_entry';
+                }
+                $archives = SessionArchive::query()
+                    ->whereIn('kind', array_keys($kinds))
+                    ->when($sessionId !== null, fn (Builder $q) => $q->where('session_id', $sessionId))
+                    ->when($from !== null, fn (Builder $q) => $q->where('last_at', '>=', $from))
+                    ->when($to !== null, fn (Builder $q) => $q->where('first_at', '<=', $to));
+                foreach ($archives->lazyById(10) as $archive) {
+                    $type = $kinds[$archive->kind];
+                    foreach ($archive->rows() as $row) {
+                        $at = isset($row['created_at']) ? Carbon::parse($row['created_at']) : null;
+                        if (($from && (!$at || $at->lt($from))) || ($to && (!$at || $at->gt($to)))) {
+                            continue;
+                        }
+                        if ($source !== null && ($row['source'] ?? null) !== $source) {
+                            continue;
+                        }
+                        $row['session_id'] = $archive->session_id;
+                        $row['created_at'] = $at?->format('Y-m-d H:i:s');
+                        $emit($type, Arr::only($row, self::COLUMNS[$type]) + ['archived' => true]);
+                    }
+                }
+            }
+
+            $flush(true);
+        }, 200, $headers);
+    }
+
+    private function scoped(Builder $query, ?string $sessionId, ?Carbon $from, ?Carbon $to): Builder
+    {
+        return $query
+            ->when($sessionId !== null, fn (Builder $q) => $q->where('session_id', $sessionId))
+            ->when($from !== null, fn (Builder $q) => $q->where('created_at', '>=', $from))
+            ->when($to !== null, fn (Builder $q) => $q->where('created_at', '<=', $to));
+    }
+
+    private function clearSession(string $sessionId): void
+    {
+        DB::transaction(function () use ($sessionId) {
+            foreach (self::TABLES as $table) {
+                DB::table($table)->where('session_id', $sessionId)->delete();
+            }
+            SessionArchive::where('session_id', $sessionId)->delete();
+        });
+    }
+
+    private function insertBatch(string $kind, array $rows): int
+    {
+        if (!$rows) {
+            return 0;
+        }
+        DB::transaction(fn () => DB::table(self::TABLES[$kind])->insert($rows));
+        return count($rows);
+    }
+
+    private function timestamp($value): ?string
+    {
+        if ($value === null || $value === '') {
+            return null;
+        }
+        try {
+            return Carbon::parse((string) $value)->format('Y-m-d H:i:s');
+        } catch (\Throwable $e) {
+            return null;
+        }
+    }
+}
@@ -0,0 +1,110 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\AnswerBankEntry;
+use App\Models\InterviewInfo;
+use App\Models\Persona;
+use App\Services\OpenAIService;
+use App\Services\PromptBuilder;
+use Illuminate\Bus\Queueable;
+use Illuminate\Contracts\Queue\ShouldBeUniqueUntilProcessing;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Bus\Dispatchable;
+use Illuminate\Queue\InteractsWithQueue;
+use Illuminate\Queue\SerializesModels;
+use Illuminate\Support\Facades\DB;
+use RuntimeException;
+
+/**
+ * Pre-generate persona-styled answers to the questions most likely to come up for the
+ * saved interview context, so /api/generate-answer can serve them without an LLM call.
+ */
+class BuildAnswerBank implements ShouldQueue, ShouldBeUniqueUntilProcessing
+{
+    use Dispatchable, InteractsWithQueue, Queueable, SerializesModels;
+
+    public int $tries = 2;
+    public int $backoff = 15;
+    public int $timeout = 180;
+
+    public function __construct(public string $sessionId, public ?int $personaId = null)
+    {
+    }
+
+    /**
+     * Repeated saves collapse into one pending build; the job reads the latest info when it runs.
+     */
+    public function uniqueId(): string
+    {
+        return $this->sessionId . '|' . ($this->personaId ?? 'none');
+    }
+
+    public function handle(OpenAIService $openai, PromptBuilder $prompts): void
+    {
+        $info = InterviewInfo::where('session_id', $this->sessionId)->first();
+        if (!$info || (!$info->role && !$info->context)) {
+            return;
+        }
+        $persona = $this->personaId ? Persona::find($this->personaId) : null;
+
+        $count = max(1, min(30, (int) env('ANSWER_BANK_SIZE', 12)));
+        $system = $prompts->system($persona, $info)
+            . "\n\nYou are preparing the candidate before the interview. Reply with JSON only: "
+            . "an array of objects with keys \"question\" and \"answer\". Write answers in the first person, "
+            . "in the persona's style, ready to be spoken.";
+        $prompt = "List the {$count} questions this interviewer is most likely to ask for this role "
+            . "(mix behavioural, role-specific technical, and company/motivation questions) and answer each one.";
+
+        $model = (string) env('ANSWER_BANK_MODEL', '') ?: null;
+        $raw = $openai->generateAnswer($prompt, null, $system, $model);
+        $pairs = $this->parsePairs($raw);
+        if (!$pairs) {
+            throw new RuntimeException('Answer bank generation returned no usable question/answer pairs');
+        }
+
+        $model ??= (string) env('OPENAI_MODEL', 'gpt-4o-mini');
+        DB::transaction(function () use ($pairs, $model) {
+            $existing = AnswerBankEntry::where('session_id', $this->sessionId);
+            $this->personaId ? $existing->where('persona_id', $this->personaId) : $existing->whereNull('persona_id');
+            $existing->delete();
+
+            $now = now();
+            AnswerBankEntry::insert(array_map(fn (array $p) => [
+                'session_id' => $this->sessionId,
+                'persona_id' => $this->personaId,
+                'question' => $p['question'],
+                'answer' => $p['answer'],
+                'model' => $model,
+                'created_at' => $now,
+                'updated_at' => $now,
+            ], $pairs));
+        });
+    }
+
+    /**
+     * Extract [{question, answer}] from the model output, tolerating code fences and
+     * a wrapping object such as {"questions": [...]}.
+     */
+    public function parsePairs(string $raw): array
+    {
+        $json = trim(preg_replace('/^```(?:json)?\s*|\s*```$/', '', trim($raw)));
+        $data = json_decode($json, true);
+        if (is_array($data) && !array_is_list($data)) {
+            $data = array_values(array_filter($data, 'is_array'))[0] ?? null;
+        }
+        if (!is_array($data)) {
+            return [];
+        }
+
+        $pairs = [];
+        foreach ($data as $row) {
+            $q = is_array($row) ? trim((string) ($row['question'] ?? '')) : '';
+            $a = is_array($row) ? trim((string) ($row['answer'] ?? '')) : '';
+            if ($q !== '' && $a !== '') {
+                $pairs[] = ['question' => $q, 'answer' => $a];
+            }
+        }
+        return $pairs;
+    }
+}
@@ -0,0 +1,15 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Factories\HasFactory;
+use Illuminate\Database\Eloquent\Model;
+
+class AnswerBankEntry extends Model
+{
+    use HasFactory;
+
+    protected $fillable = [
+        'session_id', 'persona_id', 'question', 'answer', 'model',
+    ];
+}
@@ -13,5 +13,16 @@ class QAEntry extends Model
 
     protected $fillable = [
         'session_id', 'persona_id', 'question', 'ai_answer', 'final_answer',
+        'model', 'route_reason', 'complexity', 'ttfb_ms', 'latency_ms',
+        'draft_answer', 'draft_model', 'draft_ms', 'refined_ms', 'refined_in_time',
+    ];
+
+    protected $casts = [
+        'complexity' => 'float',
+        'ttfb_ms' => 'integer',
+        'latency_ms' => 'integer',
+        'draft_ms' => 'integer',
+        'refined_ms' => 'integer',
+        'refined_in_time' => 'boolean',
     ];
 }
@@ -0,0 +1,64 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Factories\HasFactory;
+use Illuminate\Database\Eloquent\Model;
+
+class SessionArchive extends Model
+{
+    use HasFactory;
+
+    public const KIND_TRANSCRIPT = 'transcript';
+    public const KIND_QA = 'qa';
+
+    protected $fillable = [
+        'session_id', 'kind', 'row_count', 'first_at', 'last_at', 'payload',
+    ];
+
+    protected $hidden = [
+        'payload',
+    ];
+
+    protected $casts = [
+        'first_at' => 'datetime',
+        'last_at' => 'datetime',
+    ];
+
+    /**
+     * Encode rows as gzip-compressed NDJSON (one JSON object per line). Rows are
+     * compressed as they are read, so a generator never has to be held in memory.
+     */
+    public static function encodeRows(iterable $rows): string
+    {
+        $deflate = deflate_init(ZLIB_ENCODING_GZIP, ['level' => 6]);
+        $out = '';
+        foreach ($rows as $row) {
+            $out .= deflate_add($deflate, json_encode($row, JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES) . "\n", ZLIB_NO_FLUSH);
+        }
+        return $out . deflate_add($deflate, '', ZLIB_FINISH);
+    }
+
+    /**
+     * Decode this segment's rows back into arrays, oldest first.
+     */
+    public function rows(): array
+    {
+        $raw = $this->payload;
+        if (is_resource($raw)) {
+            $raw = stream_get_contents($raw);
+        }
+        $lines = $raw ? gzdecode((string) $raw) : '';
+        if ($lines === false || $lines === '') {
+            return [];
+        }
+        $rows = [];
+        foreach (explode("\n", rtrim($lines, "\n")) as $line) {
+            $row = json_decode($line, true);
+            if (is_array($row)) {
+                $rows[] = $row;
+            }
+        }
+        return $rows;
+    }
+}
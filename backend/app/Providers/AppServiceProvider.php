@@ -2,6 +2,15 @@
 
 namespace App\Providers;
 
+use App\Models\Persona;
+use App\Services\ConcurrencyGate;
+use App\Services\ModelRouter;
+use App\Services\OpenAIService;
+use App\Services\PersonaCatalog;
+use App\Services\PromptBuilder;
+use App\Services\SingleFlight;
+use Illuminate\Database\Events\ConnectionEstablished;
+use Illuminate\Support\Facades\Event;
 use Illuminate\Support\ServiceProvider;
 
 class AppServiceProvider extends ServiceProvider
@@ -11,7 +20,14 @@ class AppServiceProvider extends ServiceProvider
      */
     public function register(): void
     {
-        //
+        // Built once per process. Under Octane these are warmed at worker boot (config/octane.php)
+        // and reused by every request the worker serves; otherwise they live for one request.
+        $this->app->singleton(OpenAIService::class);
+        $this->app->singleton(PromptBuilder::class);
+        $this->app->singleton(PersonaCatalog::class);
+        $this->app->singleton(ModelRouter::class);
+        $this->app->singleton(SingleFlight::class);
+        $this->app->singleton(ConcurrencyGate::class);
     }
 
     /**
@@ -19,6 +35,27 @@ public function register(): void
      */
     public function boot(): void
     {
-        //
+        // busy_timeout / journal_mode / synchronous are applied by the SQLite connector;
+        // mmap_size has no connector option, so set it once per new connection.
+        Event::listen(ConnectionEstablished::class, function (ConnectionEstablished $event) {
+            $connection = $event->connection;
+            if ($connection->getDriverName() !== 'sqlite') {
+                return;
+            }
+            $mmap = (int) $connection->getConfig('mmap_size');
+            if ($mmap > 0) {
+                $connection->statement('PRAGMA mmap_size = ' . $mmap);
+            }
+        });
+
+        Persona::saved(fn () => $this->app->make(PersonaCatalog::class)->forget());
+        Persona::deleted(fn () => $this->app->make(PersonaCatalog::class)->forget());
+
+        // Long-lived Octane workers: clear request-scoped state on the warm services
+        if (class_exists(\Laravel\Octane\Events\RequestReceived::class)) {
+            Event::listen(\Laravel\Octane\Events\RequestReceived::class, function ($event) {
+                $event->sandbox->make(OpenAIService::class)->resetRequestState();
+            });
+        }
     }
 }
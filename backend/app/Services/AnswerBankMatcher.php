@@ -0,0 +1,166 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\AnswerBankEntry;
+
+/**
+ * BM25 matcher over a session's pre-generated answer bank.
+ *
+ * Bank questions are the documents; the query is only the last question in the prompt
+ * (the frontend submits the whole transcript). Coverage is checked both ways: the BM25
+ * score divided by the bank question's self-score says how much of the bank question
+ * was asked, and the IDF-weighted share of query terms found in the bank question says
+ * how much of the asked question it answers. The lower of the two is compared with
+ * ANSWER_BANK_MIN_MATCH, so neither a long transcript nor a question that merely
+ * mentions a banked topic can pick up a canned answer.
+ */
+class AnswerBankMatcher
+{
+    private const K1 = 1.2;
+    private const B = 0.75;
+    private const MAX_QUERY_TERMS = 24;
+
+    private const STOPWORDS = [
+        'a', 'about', 'an', 'and', 'are', 'as', 'at', 'be', 'can', 'could', 'did', 'do', 'does',
+        'for', 'from', 'have', 'how', 'i', 'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'so',
+        'that', 'the', 'this', 'to', 'us', 'was', 'we', 'were', 'what', 'when', 'where', 'which',
+        'who', 'why', 'will', 'with', 'would', 'you', 'your', 'interviewer', 'simulated',
+        // Conversational filler that shouldn't count as an unmatched query term
+        'all', 'also', 'any', 'been', 'bit', 'briefly', 'but', 'great', 'had', 'has', 'if', 'its',
+        'just', 'let', 'little', 'not', 'now', 'ok', 'okay', 'our', 'please', 'really', 'some',
+        'than', 'thank', 'thanks', 'their', 'them', 'then', 'there', 'they', 'very', 'well',
+    ];
+
+    /**
+     * Return the best bank entry for the prompt, or null when nothing clears the threshold.
+     */
+    public function match(string $prompt, string $sessionId, ?int $personaId): ?AnswerBankEntry
+    {
+        $query = AnswerBankEntry::where('session_id', $sessionId);
+        if ($personaId) {
+            $query->where('persona_id', $personaId);
+        } else {
+            $query->whereNull('persona_id');
+        }
+        $entries = $query->get(['id', 'question', 'answer', 'model']);
+        if ($entries->isEmpty()) {
+            return null;
+        }
+
+        [$index, $ratio] = $this->best($prompt, $entries->pluck('question')->all());
+        $threshold = (float) env('ANSWER_BANK_MIN_MATCH', 0.6);
+        return ($index !== null && $ratio >= $threshold) ? $entries[$index] : null;
+    }
+
+    /**
+     * Find the bank question that best matches the prompt's last question.
+     *
+     * @param  string[]  $questions
+     * @return array{0: ?int, 1: float} index into $questions (null when nothing overlaps) and its 0..1 ratio
+     */
+    public function best(string $prompt, array $questions): array
+    {
+        $terms = array_slice($this->tokenize($this->lastQuestion($prompt)), -self::MAX_QUERY_TERMS);
+        $queryTerms = array_count_values($terms);
+        if (!$queryTerms || !$questions) {
+            return [null, 0.0];
+        }
+
+        $docs = [];
+        $df = [];
+        $totalLen = 0;
+        foreach (array_values($questions) as $i => $question) {
+            $tf = array_count_values($this->tokenize((string) $question));
+            $docs[$i] = $tf;
+            $totalLen += array_sum($tf);
+            foreach ($tf as $term => $_) {
+                $df[$term] = ($df[$term] ?? 0) + 1;
+            }
+        }
+        $n = count($docs);
+        $avgLen = max(1.0, $totalLen / $n);
+
+        $queryWeight = 0.0;
+        foreach ($queryTerms as $term => $_) {
+            $queryWeight += $this->idf($term, $df, $n);
+        }
+
+        $best = null;
+        $bestRatio = 0.0;
+        foreach ($docs as $i => $tf) {
+            $self = $this->score($tf, $tf, $df, $n, $avgLen);
+            if ($self <= 0.0) {
+                continue;
+            }
+            $docCoverage = $this->score($queryTerms, $tf, $df, $n, $avgLen) / $self;
+            $matched = 0.0;
+            foreach (array_intersect_key($queryTerms, $tf) as $term => $_) {
+                $matched += $this->idf($term, $df, $n);
+            }
+            $ratio = min($docCoverage, $matched / $queryWeight);
+            if ($ratio > $bestRatio) {
+                $bestRatio = $ratio;
+                $best = $i;
+            }
+        }
+        return [$best, round($bestRatio, 3)];
+    }
+
+    /**
+     * The last sentence containing a question mark, or the last sentence when speech
+     * recognition dropped the punctuation.
+     */
+    public function lastQuestion(string $prompt): string
+    {
+        $sentences = preg_split('/(?<=[.?!])\s+|\R+/u', trim($prompt), -1, PREG_SPLIT_NO_EMPTY) ?: [];
+        for ($i = count($sentences) - 1; $i >= 0; $i--) {
+            if (str_contains($sentences[$i], '?')) {
+                return trim($sentences[$i]);
+            }
+        }
+        return $sentences ? trim(end($sentences)) : '';
+    }
+
+    /**
+     * BM25 score of a (term => count) query against one document's term frequencies.
+     * Query term counts are ignored so a long transcript can't outweigh a short question.
+     */
+    private function score(array $queryTerms, array $tf, array $df, int $n, float $avgLen): float
+    {
+        $len = array_sum($tf);
+        $score = 0.0;
+        foreach ($queryTerms as $term => $_) {
+            if (!isset($tf[$term])) {
+                continue;
+            }
+            $f = $tf[$term];
+            $score += $this->idf($term, $df, $n) * ($f * (self::K1 + 1)) / ($f + self::K1 * (1 - self::B + self::B * $len / $avgLen));
+        }
+        return $score;
+    }
+
+    /**
+     * BM25 IDF; terms missing from every bank question get the highest weight.
+     */
+    private function idf(string $term, array $df, int $n): float
+    {
+        $d = $df[$term] ?? 0;
+        return log(1 + ($n - $d + 0.5) / ($d + 0.5));
+    }
+
+    private function tokenize(string $text): array
+    {
+        $words = preg_split('/[^a-z0-9+#]+/', strtolower($text), -1, PREG_SPLIT_NO_EMPTY) ?: [];
+        $out = [];
+        foreach ($words as $w) {
+            if (strlen($w) < 2 || in_array($w, self::STOPWORDS, true)) {
+                continue;
+            }
+            // Light stemming: plural / -ing / -ed endings
+            $w = preg_replace('/(?<=\w{3})(ing|ed|es|s)$/', '', $w);
+            $out[] = $w;
+        }
+        return $out;
+    }
+}
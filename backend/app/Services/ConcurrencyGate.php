@@ -0,0 +1,180 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Str;
+
+/**
+ * Caps in-flight answer generations per session and globally, with a fair wait queue.
+ *
+ * Scheduler state (running and waiting tickets) lives in one cache entry guarded by a
+ * cache lock, so it is shared by every PHP worker. When a slot frees up it goes to the
+ * waiting ticket whose session currently has the fewest generations running (oldest
+ * first on ties), so one session flooding requests can't starve the others. Tickets
+ * expire, so a crashed worker can't hold a slot forever.
+ *
+ * Waiters poll with plain reads and only take the lock to register, to refresh their
+ * heartbeat about once a second, and when the state they read says they are next.
+ */
+class ConcurrencyGate
+{
+    private const STATE_KEY = 'gen:sched';
+    private const LOCK_KEY = 'gen:sched:lock';
+    // A waiter that hasn't refreshed its heartbeat for this long is assumed gone
+    private const WAITER_STALE_SECONDS = 5;
+    private const HEARTBEAT_SECONDS = 1.0;
+    private const RELEASE_ATTEMPTS = 3;
+
+    private int $perSession;
+    private int $global;
+    private int $timeoutMs;
+    private int $ticketSeconds;
+
+    public function __construct(?int $perSession = null, ?int $global = null, ?int $timeoutMs = null, ?int $ticketSeconds = null)
+    {
+        $this->perSession = max(0, $perSession ?? (int) env('GEN_MAX_PER_SESSION', 2));
+        $this->global = max(0, $global ?? (int) env('GEN_MAX_INFLIGHT', 16));
+        $this->timeoutMs = max(0, $timeoutMs ?? (int) env('GEN_QUEUE_TIMEOUT_MS', 15000));
+        $this->ticketSeconds = max(1, $ticketSeconds ?? (int) env('GEN_TICKET_SECONDS', 120));
+    }
+
+    public function enabled(): bool
+    {
+        return $this->perSession > 0 || $this->global > 0;
+    }
+
+    /** Longest acquire() waits for a slot, in ms. */
+    public function timeoutMs(): int
+    {
+        return $this->timeoutMs;
+    }
+
+    /**
+     * Wait for a slot. Returns a ticket to pass to release(), or null on timeout.
+     */
+    public function acquire(string $sessionId): ?string
+    {
+        $ticket = (string) Str::uuid();
+        $deadline = microtime(true) + $this->timeoutMs / 1000;
+        $heartbeat = 0.0;
+        do {
+            $now = microtime(true);
+            if ($now - $heartbeat < self::HEARTBEAT_SECONDS && !$this->isNext($ticket)) {
+                usleep(random_int(75, 150) * 1000);
+                continue;
+            }
+            $heartbeat = $now;
+            $granted = $this->mutate(function (array $state) use ($ticket, $sessionId) {
+                $now = microtime(true);
+                $state = $this->purge($state, $now);
+                $state['waiting'][$ticket] ??= ['session' => $sessionId, 'since' => $now];
+                $state['waiting'][$ticket]['seen'] = $now;
+                if ($this->next($state) !== $ticket) {
+                    return [$state, false];
+                }
+                unset($state['waiting'][$ticket]);
+                $state['running'][$ticket] = ['session' => $sessionId, 'expires' => $now + $this->ticketSeconds];
+                return [$state, true];
+            });
+            if ($granted) {
+                return $ticket;
+            }
+            usleep(random_int(75, 150) * 1000);
+        } while (microtime(true) < $deadline);
+
+        $this->mutate(function (array $state) use ($ticket) {
+            unset($state['waiting'][$ticket]);
+            return [$state, null];
+        });
+        return null;
+    }
+
+    /**
+     * Free the ticket's slot. Retried on lock timeouts: a dropped release would hold the
+     * slot until the ticket expires (GEN_TICKET_SECONDS).
+     */
+    public function release(string $ticket): void
+    {
+        for ($attempt = 1; $attempt <= self::RELEASE_ATTEMPTS; $attempt++) {
+            $released = $this->mutate(function (array $state) use ($ticket) {
+                unset($state['running'][$ticket]);
+                return [$state, true];
+            });
+            if ($released === true) {
+                return;
+            }
+        }
+        Log::warning('ConcurrencyGate: could not release ticket; its slot stays taken until it expires', [
+            'ticket' => $ticket,
+            'expires_in_seconds' => $this->ticketSeconds,
+        ]);
+    }
+
+    /**
+     * The waiting ticket that should get the next free slot, or null if none may start.
+     *
+     * @param  array{running: array, waiting: array}  $state
+     */
+    public function next(array $state): ?string
+    {
+        if ($this->global > 0 && count($state['running']) >= $this->global) {
+            return null;
+        }
+        $running = array_count_values(array_column($state['running'], 'session'));
+        $best = null;
+        $bestRunning = PHP_INT_MAX;
+        $bestSince = INF;
+        foreach ($state['waiting'] as $id => $w) {
+            $n = $running[$w['session']] ?? 0;
+            if ($this->perSession > 0 && $n >= $this->perSession) {
+                continue;
+            }
+            if ($n < $bestRunning || ($n === $bestRunning && $w['since'] < $bestSince)) {
+                $best = (string) $id;
+                $bestRunning = $n;
+                $bestSince = $w['since'];
+            }
+        }
+        return $best;
+    }
+
+    /**
+     * Drop expired running tickets and waiters whose heartbeat went stale.
+     */
+    public function purge(array $state, float $now): array
+    {
+        $state['running'] = array_filter($state['running'], fn ($t) => $t['expires'] > $now);
+        $state['waiting'] = array_filter($state['waiting'], fn ($t) => $t['seen'] > $now - self::WAITER_STALE_SECONDS);
+        return $state;
+    }
+
+    /**
+     * Lock-free check whether the ticket would be granted the next free slot.
+     */
+    private function isNext(string $ticket): bool
+    {
+        $state = Cache::get(self::STATE_KEY, []) + ['running' => [], 'waiting' => []];
+        return $this->next($this->purge($state, microtime(true))) === $ticket;
+    }
+
+    /**
+     * Read-modify-write the scheduler state under the scheduler lock.
+     * $fn receives the state and returns [newState, result]; a lock timeout yields false.
+     */
+    private function mutate(callable $fn)
+    {
+        try {
+            return Cache::lock(self::LOCK_KEY, 5)->betweenBlockedAttemptsSleepFor(10)->block(3, function () use ($fn) {
+                $state = Cache::get(self::STATE_KEY, []) + ['running' => [], 'waiting' => []];
+                [$state, $result] = $fn($state);
+                Cache::put(self::STATE_KEY, $state, now()->addMinutes(10));
+                return $result;
+            });
+        } catch (LockTimeoutException $e) {
+            return false;
+        }
+    }
+}
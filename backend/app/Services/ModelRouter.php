@@ -0,0 +1,200 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Support\Facades\Cache;
+
+/**
+ * Picks a chat model per question when the client asks for "auto".
+ *
+ * Complexity is scored 0..1 from cheap local features (length, question type,
+ * technical vocabulary). Simple questions go to the fast model; complex ones go to the
+ * strong model unless its rolling p95 completion latency is over the SLO, in which case
+ * they fall back to the fast model. Latency samples are kept per model in the cache as
+ * a fixed-size window fed by record(), which updates it under a per-model cache lock.
+ * Samples older than ROUTER_SAMPLE_MAX_AGE_MINUTES are ignored: while in fallback the
+ * strong model gets no new samples, so its slow ones age out and it is tried again.
+ */
+class ModelRouter
+{
+    public const AUTO = 'auto';
+
+    private const OPEN_ENDED = [
+        'design', 'architect', 'architecture', 'tradeoff', 'tradeoffs', 'trade-off', 'trade-offs',
+        'compare', 'comparison', 'versus', 'vs', 'why', 'explain', 'walk', 'approach', 'scale',
+        'scaling', 'optimize', 'optimise', 'debug', 'improve', 'difference', 'pros', 'cons',
+        'implement', 'handle', 'strategy', 'challenge', 'challenging', 'conflict', 'failure',
+    ];
+
+    private const SHORT_FORM = [
+        'is', 'are', 'do', 'does', 'did', 'can', 'have', 'has', 'was', 'were', 'will', 'name', 'list',
+    ];
+
+    private const TECHNICAL = [
+        'algorithm', 'api', 'async', 'cache', 'caching', 'complexity', 'concurrency', 'consistency',
+        'container', 'database', 'deadlock', 'distributed', 'docker', 'index', 'indexes', 'kafka',
+        'kubernetes', 'latency', 'load', 'lock', 'memory', 'microservice', 'microservices', 'mutex',
+        'queue', 'race', 'redis', 'replication', 'rest', 'schema', 'sharding', 'sql', 'thread',
+        'threads', 'throughput', 'transaction', 'transactions', 'graphql', 'grpc', 'oauth',
+        'encryption', 'tcp', 'http', 'recursion', 'tree', 'graph', 'hash', 'heap', 'big-o',
+    ];
+
+    private string $fastModel;
+    private string $strongModel;
+    private float $threshold;
+    private int $sloMs;
+    private int $window;
+    private int $minSamples;
+    private bool $upgradeOnRetry;
+    private int $maxAgeMinutes;
+
+    public function __construct(
+        ?string $fastModel = null,
+        ?string $strongModel = null,
+        ?float $threshold = null,
+        ?int $sloMs = null,
+        ?int $window = null,
+        ?int $minSamples = null,
+        ?bool $upgradeOnRetry = null,
+        ?int $maxAgeMinutes = null,
+    ) {
+        $this->fastModel = $fastModel ?? (string) env('ROUTER_FAST_MODEL', 'gpt-4o-mini');
+        $this->strongModel = $strongModel ?? (string) env('ROUTER_STRONG_MODEL', 'gpt-4o');
+        $this->threshold = $threshold ?? (float) env('ROUTER_COMPLEXITY_THRESHOLD', 0.55);
+        $this->sloMs = $sloMs ?? (int) env('ROUTER_LATENCY_SLO_MS', 6000);
+        $this->window = max(5, $window ?? (int) env('ROUTER_WINDOW', 50));
+        $this->minSamples = max(1, $minSamples ?? (int) env('ROUTER_MIN_SAMPLES', 5));
+        $this->upgradeOnRetry = $upgradeOnRetry ?? filter_var(env('ROUTER_UPGRADE_ON_RETRY', true), FILTER_VALIDATE_BOOLEAN);
+        $this->maxAgeMinutes = max(1, $maxAgeMinutes ?? (int) env('ROUTER_SAMPLE_MAX_AGE_MINUTES', 15));
+    }
+
+    public function fastModel(): string
+    {
+        return $this->fastModel;
+    }
+
+    public function strongModel(): string
+    {
+        return $this->strongModel;
+    }
+
+    /**
+     * Decide which model answers the prompt.
+     *
+     * @return array{model: string, reason: string, complexity: float}
+     */
+    public function route(string $prompt, ?string $requested, bool $retry = false): array
+    {
+        $complexity = $this->complexity($prompt);
+        $requested = $requested ?: (string) env('OPENAI_MODEL', $this->fastModel);
+
+        if ($retry && $this->upgradeOnRetry && $requested !== $this->strongModel) {
+            return ['model' => $this->strongModel, 'reason' => 'retry_upgrade', 'complexity' => $complexity];
+        }
+        if ($requested !== self::AUTO) {
+            return ['model' => $requested, 'reason' => 'manual', 'complexity' => $complexity];
+        }
+        if ($complexity < $this->threshold) {
+            return ['model' => $this->fastModel, 'reason' => 'simple', 'complexity' => $complexity];
+        }
+        $strong = $this->stats($this->strongModel);
+        if ($strong['samples'] >= $this->minSamples && $strong['latency_p95_ms'] > $this->sloMs) {
+            return ['model' => $this->fastModel, 'reason' => 'slo_fallback', 'complexity' => $complexity];
+        }
+        return ['model' => $this->strongModel, 'reason' => 'complex', 'complexity' => $complexity];
+    }
+
+    /**
+     * Score the prompt's complexity from 0 (quick factual) to 1 (open-ended technical).
+     */
+    public function complexity(string $prompt): float
+    {
+        // The frontend submits the whole transcript; the question is usually at the end
+        $text = mb_strtolower(mb_substr(trim($prompt), -1500));
+        preg_match_all('/[a-z0-9][a-z0-9\-]*/u', $text, $m);
+        $words = $m[0];
+        $n = count($words);
+        if ($n === 0) {
+            return 0.0;
+        }
+
+        // Length: saturates around 60 words
+        $score = 0.35 * min(1.0, $n / 60);
+
+        // Question type: open-ended prompts need more reasoning than yes/no or "name X"
+        $vocab = array_flip($words);
+        $openEnded = count(array_intersect_key(array_flip(self::OPEN_ENDED), $vocab));
+        $score += 0.35 * min(1.0, $openEnded / 2);
+        if ($openEnded === 0 && in_array($words[0], self::SHORT_FORM, true)) {
+            $score -= 0.1;
+        }
+
+        // Technical vocabulary density
+        $technical = count(array_intersect_key(array_flip(self::TECHNICAL), $vocab));
+        $score += 0.3 * min(1.0, $technical / 3);
+
+        return round(max(0.0, min(1.0, $score)), 3);
+    }
+
+    /**
+     * Add one completed call to the model's rolling window.
+     */
+    public function record(string $model, ?float $ttfbMs, float $latencyMs): void
+    {
+        $key = $this->key($model);
+        $sample = [$ttfbMs === null ? null : (int) round($ttfbMs), (int) round($latencyMs), now()->getTimestamp()];
+        try {
+            // Read-modify-write: without the lock, concurrent requests overwrite each other's samples
+            Cache::lock($key . ':lock', 5)->block(2, function () use ($key, $sample) {
+                $samples = $this->fresh(Cache::get($key, []));
+                $samples[] = $sample;
+                if (count($samples) > $this->window) {
+                    $samples = array_slice($samples, -$this->window);
+                }
+                Cache::put($key, $samples, now()->addMinutes($this->maxAgeMinutes));
+            });
+        } catch (LockTimeoutException $e) {
+            // Losing one sample under heavy contention only makes the window slightly staler
+        }
+    }
+
+    /**
+     * Rolling TTFB/latency percentiles for a model, over samples younger than the max age.
+     *
+     * @return array{samples: int, ttfb_p50_ms: ?int, latency_p50_ms: ?int, latency_p95_ms: ?int}
+     */
+    public function stats(string $model): array
+    {
+        $samples = $this->fresh(Cache::get($this->key($model), []));
+        $ttfb = array_values(array_filter(array_column($samples, 0), fn ($v) => $v !== null));
+        $latency = array_column($samples, 1);
+        return [
+            'samples' => count($samples),
+            'ttfb_p50_ms' => $this->percentile($ttfb, 50),
+            'latency_p50_ms' => $this->percentile($latency, 50),
+            'latency_p95_ms' => $this->percentile($latency, 95),
+        ];
+    }
+
+    private function fresh(array $samples): array
+    {
+        $cutoff = now()->getTimestamp() - $this->maxAgeMinutes * 60;
+        return array_values(array_filter($samples, fn (array $s) => ($s[2] ?? 0) >= $cutoff));
+    }
+
+    private function percentile(array $values, int $pct): ?int
+    {
+        if (!$values) {
+            return null;
+        }
+        sort($values);
+        $idx = (int) max(0, min(count($values) - 1, ceil($pct / 100 * count($values)) - 1));
+        return (int) $values[$idx];
+    }
+
+    private function key(string $model): string
+    {
+        return 'router:latency:' . $model;
+    }
+}
@@ -7,24 +7,67 @@
 class OpenAIService
 {
     private string $apiKey;
+    private string $baseUrl;
     private $client = null;
+    /** Timing of the most recent generateAnswer() call (see lastMetrics()). */
+    private array $lastMetrics = [];
+    /** Reused cURL handle: keeps the connection (and TLS session) alive across calls in a long-lived worker. */
+    private $curl = null;
+    /** Reused multi handle for generateConcurrent(); it owns its own connection cache. */
+    private $multi = null;
 
     public function __construct()
     {
         $this->apiKey = (string) env('OPENAI_API_KEY', '');
+        // Overridable so load tests can point at a local stub (see tools/openai_stub.py)
+        $this->baseUrl = rtrim((string) env('OPENAI_BASE_URL', 'https://api.openai.com/v1'), '/');
         if ($this->apiKey && class_exists('OpenAI\\Client') && class_exists('OpenAI')) {
             // openai-php/client style
-            $this->client = \OpenAI::client($this->apiKey);
+            $this->client = \OpenAI::factory()
+                ->withApiKey($this->apiKey)
+                ->withBaseUri($this->baseUrl)
+                ->withHttpClient(new \GuzzleHttp\Client(['timeout' => self::timeoutSeconds(), 'connect_timeout' => 10]))
+                ->make();
         }
     }
 
+    /**
+     * Per-call request timeout in seconds (OPENAI_TIMEOUT_SECONDS, default 60), shared by the
+     * SDK and cURL paths. SingleFlight sizes its lock from it.
+     */
+    public static function timeoutSeconds(): int
+    {
+        return max(1, (int) env('OPENAI_TIMEOUT_SECONDS', 60));
+    }
+
     public function available(): bool
     {
         return !empty($this->apiKey);
     }
 
+    /**
+     * Model, TTFB and total latency (ms) of the last generateAnswer() call.
+     * Both paths stream the completion, so ttfb_ms is the time to the first content token
+     * (null when the call failed before any arrived).
+     *
+     * @return array{model?: string, ttfb_ms?: ?float, latency_ms?: float, ok?: bool}
+     */
+    public function lastMetrics(): array
+    {
+        return $this->lastMetrics;
+    }
+
+    /**
+     * Clear per-request state. Called between requests when the service is kept warm in an Octane worker.
+     */
+    public function resetRequestState(): void
+    {
+        $this->lastMetrics = [];
+    }
+
     public function generateAnswer(string $prompt, ?int $personaId = null, ?string $systemOverride = null, ?string $modelOverride = null): string
     {
+        $this->lastMetrics = [];
         if (!$this->available()) {
             return '[OpenAI key missing]';
         }
@@ -32,14 +75,13 @@ public function generateAnswer(string $prompt, ?int $personaId = null, ?string $
         $system = $systemOverride ?: 'You are a concise, expert assistant. Answer in the user\'s saved style/persona if provided. Prefer short, high-signal responses.';
 
         // Select model (UI override > env > default)
-        $modelToUse = (function() use ($modelOverride) {
-            return $modelOverride ?: (string) env('OPENAI_MODEL', 'gpt-4o-mini');
-        })();
+        $modelToUse = $this->resolveModel($modelOverride);
+        $started = microtime(true);
 
-        // Prefer library if installed
+        // Prefer library if installed; streamed so the router gets a real time-to-first-token
         if ($this->client) {
             try {
-                $response = $this->client->chat()->create([
+                $stream = $this->client->chat()->createStreamed([
                     'model' => $modelToUse,
                     'temperature' => 0.4,
                     'messages' => [
@@ -47,48 +89,219 @@ public function generateAnswer(string $prompt, ?int $personaId = null, ?string $
                         ['role' => 'user', 'content' => $prompt],
                     ],
                 ]);
-                $choice = $response->choices[0] ?? null;
-                if ($choice && isset($choice->message->content)) {
-                    return trim((string) $choice->message->content);
+                $answer = null;
+                $ttfb = null;
+                foreach ($stream as $chunk) {
+                    $delta = $chunk->choices[0]->delta->content ?? null;
+                    if ($delta === null) {
+                        continue;
+                    }
+                    $answer = ($answer ?? '') . $delta;
+                    if ($ttfb === null && $delta !== '') {
+                        $ttfb = (microtime(true) - $started) * 1000;
+                    }
+                }
+                if ($answer !== null) {
+                    $this->lastMetrics = [
+                        'model' => $modelToUse,
+                        'ttfb_ms' => $ttfb,
+                        'latency_ms' => (microtime(true) - $started) * 1000,
+                        'ok' => true,
+                    ];
+                    return trim($answer);
                 }
             } catch (\Throwable $e) {
                 // fall through to HTTP client
             }
         }
 
-        // Fallback: direct HTTP call to OpenAI Chat Completions
+        // Fallback: direct HTTP call to OpenAI Chat Completions, within what is left of the
+        // timeout so a timed-out SDK call doesn't double the worst case
+        $remainingMs = (int) (self::timeoutSeconds() * 1000 - (microtime(true) - $started) * 1000);
+        if ($remainingMs <= 0) {
+            return '[OpenAI request failed]';
+        }
+        $ch = $this->curl ??= curl_init();
+        curl_reset($ch);
+        $body = $this->prepareCurl($ch, $modelToUse, $system, $prompt);
+        curl_setopt($ch, CURLOPT_TIMEOUT_MS, $remainingMs);
+        if (curl_exec($ch) === false) {
+            return '[OpenAI request failed]';
+        }
+        [$answer, $this->lastMetrics] = $this->readCurlResult($ch, $body, $modelToUse, $started);
+        return $answer;
+    }
+
+    /**
+     * Run several chat completions in parallel over curl_multi (HTTP path only).
+     *
+     * $requests maps a key to ['prompt' => ..., 'system' => ?string, 'model' => ?string,
+     * 'deadline' => ?float, 'abandon_at' => ?float] (absolute microtime(true) values).
+     * $onComplete($key, $answer, $metrics) is called from this process as each request
+     * finishes, in completion order, so callers can stream early results. A request still
+     * running at its deadline is reported with a null answer and metrics['timed_out'] = true
+     * but is left running; it is reported again when it completes, unless it is still running
+     * at abandon_at (or at its deadline when $abandonAfterDeadline is set), when it is dropped.
+     */
+    public function generateConcurrent(array $requests, callable $onComplete, bool $abandonAfterDeadline = false): void
+    {
+        $started = microtime(true);
+        if (!$this->available()) {
+            foreach ($requests as $key => $r) {
+                $onComplete($key, '[OpenAI key missing]', ['model' => $this->resolveModel($r['model'] ?? null), 'ttfb_ms' => null, 'latency_ms' => 0.0, 'ok' => false]);
+            }
+            return;
+        }
+
+        $mh = $this->multi ??= curl_multi_init();
+        $pending = [];
+        foreach ($requests as $key => $r) {
+            $model = $this->resolveModel($r['model'] ?? null);
+            $ch = curl_init();
+            $body = $this->prepareCurl($ch, $model, $r['system'] ?? PromptBuilder::BASE_SYSTEM, (string) $r['prompt']);
+            curl_multi_add_handle($mh, $ch);
+            $deadline = $r['deadline'] ?? null;
+            $abandonAt = $r['abandon_at'] ?? ($abandonAfterDeadline ? $deadline : null);
+            $pending[$key] = ['ch' => $ch, 'body' => $body, 'model' => $model, 'deadline' => $deadline, 'abandon_at' => $abandonAt, 'late' => false];
+        }
+
+        do {
+            $status = curl_multi_exec($mh, $running);
+            while ($info = curl_multi_info_read($mh)) {
+                foreach ($pending as $key => $p) {
+                    if ($p['ch'] !== $info['handle']) {
+                        continue;
+                    }
+                    if ($info['result'] !== CURLE_OK) {
+                        $answer = '[OpenAI request failed]';
+                        $metrics = ['model' => $p['model'], 'ttfb_ms' => null, 'latency_ms' => (microtime(true) - $started) * 1000, 'ok' => false];
+                    } else {
+                        [$answer, $metrics] = $this->readCurlResult($p['ch'], $p['body'], $p['model'], $started);
+                    }
+                    $metrics['timed_out'] = $p['late'];
+                    curl_multi_remove_handle($mh, $p['ch']);
+                    curl_close($p['ch']);
+                    unset($pending[$key]);
+                    $onComplete($key, $answer, $metrics);
+                    break;
+                }
+            }
+
+            $now = microtime(true);
+            $wait = 0.05;
+            foreach ($pending as $key => $p) {
+                $reportLate = !$p['late'] && (
+                    ($p['deadline'] !== null && $now >= $p['deadline'])
+                    || ($p['abandon_at'] !== null && $now >= $p['abandon_at'])
+                );
+                if ($reportLate) {
+                    $pending[$key]['late'] = true;
+                    $onComplete($key, null, ['model' => $p['model'], 'ttfb_ms' => null, 'latency_ms' => ($now - $started) * 1000, 'ok' => false, 'timed_out' => true]);
+                } elseif (!$p['late'] && $p['deadline'] !== null) {
+                    $wait = min($wait, $p['deadline'] - $now);
+                }
+                if ($p['abandon_at'] !== null) {
+                    if ($now >= $p['abandon_at']) {
+                        curl_multi_remove_handle($mh, $p['ch']);
+                        curl_close($p['ch']);
+                        unset($pending[$key]);
+                    } else {
+                        $wait = min($wait, $p['abandon_at'] - $now);
+                    }
+                }
+            }
+            if ($pending && $running) {
+                curl_multi_select($mh, max(0.001, $wait));
+            }
+        } while ($pending && $status === CURLM_OK);
+    }
+
+    private function resolveModel(?string $modelOverride): string
+    {
+        $model = $modelOverride ?: (string) env('OPENAI_MODEL', 'gpt-4o-mini');
+        // "auto" is resolved by ModelRouter; callers that bypass it get the fast model
+        return $model === ModelRouter::AUTO ? (string) env('ROUTER_FAST_MODEL', 'gpt-4o-mini') : $model;
+    }
+
+    /**
+     * Configure a streamed Chat Completions request on $ch. The returned object collects
+     * the response body and the time the first content token arrived.
+     */
+    private function prepareCurl($ch, string $model, string $system, string $prompt): \stdClass
+    {
         $payload = [
-            'model' => $modelToUse,
+            'model' => $model,
             'temperature' => 0.4,
+            'stream' => true,
             'messages' => [
                 ['role' => 'system', 'content' => $system],
                 ['role' => 'user', 'content' => $prompt],
             ],
         ];
-
-        $ch = curl_init('https://api.openai.com/v1/chat/completions');
+        $body = (object) ['raw' => '', 'firstTokenAt' => null];
         curl_setopt_array($ch, [
-            CURLOPT_RETURNTRANSFER => true,
+            CURLOPT_URL => $this->baseUrl . '/chat/completions',
             CURLOPT_POST => true,
             CURLOPT_HTTPHEADER => [
                 'Authorization: Bearer ' . $this->apiKey,
                 'Content-Type: application/json',
             ],
             CURLOPT_POSTFIELDS => json_encode($payload),
-            CURLOPT_TIMEOUT => 60,
+            CURLOPT_TIMEOUT => self::timeoutSeconds(),
+            CURLOPT_WRITEFUNCTION => function ($ch, string $data) use ($body): int {
+                // The first delta only carries the role (empty content); wait for text
+                if ($body->firstTokenAt === null && preg_match('/"content"\s*:\s*"[^"]/', $data)) {
+                    $body->firstTokenAt = microtime(true);
+                }
+                $body->raw .= $data;
+                return strlen($data);
+            },
         ]);
-        $raw = curl_exec($ch);
-        if ($raw === false) {
-            curl_close($ch);
-            return '[OpenAI request failed]';
-        }
+        return $body;
+    }
+
+    /**
+     * @return array{0: string, 1: array} answer (or error marker) and timing metrics
+     */
+    private function readCurlResult($ch, \stdClass $body, string $model, float $started): array
+    {
         $code = curl_getinfo($ch, CURLINFO_HTTP_CODE);
-        curl_close($ch);
-        $data = json_decode($raw, true);
-        if ($code >= 200 && $code < 300 && isset($data['choices'][0]['message']['content'])) {
-            return trim((string) $data['choices'][0]['message']['content']);
+        $answer = $code >= 200 && $code < 300 ? $this->parseCompletion($body->raw) : null;
+        $metrics = [
+            'model' => $model,
+            'ttfb_ms' => $body->firstTokenAt ? ($body->firstTokenAt - $started) * 1000 : null,
+            'latency_ms' => (microtime(true) - $started) * 1000,
+            'ok' => $answer !== null,
+        ];
+        return [$answer !== null ? trim($answer) : '[OpenAI error]', $metrics];
+    }
+
+    /**
+     * Join the content deltas of an SSE completion stream. Falls back to a plain JSON
+     * completion for compatible endpoints that ignore "stream". Null when neither parses.
+     */
+    private function parseCompletion(string $raw): ?string
+    {
+        $answer = null;
+        foreach (preg_split('/\r?\n/', $raw) as $line) {
+            if (!str_starts_with($line, 'data:')) {
+                continue;
+            }
+            $data = trim(substr($line, 5));
+            if ($data === '[DONE]') {
+                break;
+            }
+            $event = json_decode($data, true);
+            if (isset($event['choices'][0]['delta'])) {
+                $answer = ($answer ?? '') . ($event['choices'][0]['delta']['content'] ?? '');
+            }
         }
-        return '[OpenAI error]';
+        if ($answer === null) {
+            $data = json_decode($raw, true);
+            if (isset($data['choices'][0]['message']['content'])) {
+                $answer = (string) $data['choices'][0]['message']['content'];
+            }
+        }
+        return $answer;
     }
 }
-
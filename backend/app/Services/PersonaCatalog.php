@@ -0,0 +1,60 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Persona;
+use Illuminate\Support\Collection;
+
+/**
+ * In-memory persona list.
+ *
+ * Registered as a singleton and warmed by Octane, so a long-lived worker loads the
+ * personas once and reuses them across requests. Under php-fpm / `artisan serve` it lives
+ * for one request and behaves like a plain query. Entries are refreshed after
+ * PERSONA_CACHE_SECONDS, and immediately in the worker that saves a persona.
+ */
+class PersonaCatalog
+{
+    private ?Collection $personas = null;
+    private float $loadedAt = 0.0;
+    private int $ttlSeconds;
+
+    public function __construct()
+    {
+        $this->ttlSeconds = max(0, (int) env('PERSONA_CACHE_SECONDS', 60));
+    }
+
+    /**
+     * All personas ordered by id, keyed by id.
+     */
+    public function all(): Collection
+    {
+        if ($this->personas === null || microtime(true) - $this->loadedAt > $this->ttlSeconds) {
+            $this->personas = Persona::query()
+                ->select(['id', 'name', 'description', 'system_prompt'])
+                ->orderBy('id')
+                ->get()
+                ->keyBy('id');
+            $this->loadedAt = microtime(true);
+        }
+        return $this->personas;
+    }
+
+    public function find(?int $id): ?Persona
+    {
+        if (!$id) {
+            return null;
+        }
+        $persona = $this->all()->get($id);
+        if (!$persona && ($persona = Persona::find($id))) {
+            // Created by another worker since we loaded; reload on next use
+            $this->forget();
+        }
+        return $persona;
+    }
+
+    public function forget(): void
+    {
+        $this->personas = null;
+    }
+}
@@ -0,0 +1,59 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\InterviewInfo;
+use App\Models\Persona;
+
+class PromptBuilder
+{
+    public const BASE_SYSTEM = "You are a concise, expert assistant. Prefer short, high-signal responses.";
+
+    private int $notesLimit;
+
+    public function __construct()
+    {
+        $this->notesLimit = (int) env('INTERVIEW_NOTES_SOFT_LIMIT', 10000);
+    }
+
+    /**
+     * Build the system prompt: base instructions + persona + interview context.
+     */
+    public function system(?Persona $persona, ?InterviewInfo $info): string
+    {
+        $system = self::BASE_SYSTEM;
+
+        // Persona enrichment
+        if ($persona) {
+            $system .= "\n\nPersona instructions:\n" . $persona->system_prompt;
+        }
+
+        // Interview info enrichment
+        if ($info) {
+            $system .= "\n\nInterview context:";
+            if ($info->company) { $system .= "\nCompany: {$info->company}"; }
+            if ($info->role) { $system .= "\nRole: {$info->role}"; }
+            if ($info->context) {
+                $system .= "\nNotes:\n" . $this->notes((string) $info->context);
+            }
+        }
+
+        return $system;
+    }
+
+    /**
+     * Apply the INTERVIEW_NOTES_SOFT_LIMIT head/tail truncation.
+     */
+    public function notes(string $notes): string
+    {
+        $limit = $this->notesLimit;
+        if (strlen($notes) > $limit) {
+            $headLen = (int) floor($limit * 0.7);
+            $tailLen = (int) floor($limit * 0.25);
+            $head = substr($notes, 0, $headLen);
+            $tail = substr($notes, -$tailLen);
+            $notes = $head . "\n[... truncated for speed/context ...]\n" . $tail;
+        }
+        return $notes;
+    }
+}
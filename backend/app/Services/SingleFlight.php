@@ -0,0 +1,73 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Support\Facades\Cache;
+
+/**
+ * Request coalescing: concurrent callers with the same key share one execution.
+ *
+ * The first caller takes an atomic cache lock and runs the producer; its result is kept
+ * in the cache for a few seconds. Callers that find the lock taken block on it and, once
+ * the leader releases, read the shared result. If the leader failed (no result stored)
+ * the waiter already holds the lock and produces the value itself.
+ */
+class SingleFlight
+{
+    // Slack on top of the leader's worst case for prompt building and the DB writes
+    private const MARGIN_SECONDS = 10;
+
+    private int $lockSeconds;
+    private int $waitSeconds;
+    private int $resultSeconds;
+
+    public function __construct(ConcurrencyGate $gate)
+    {
+        // The leader may queue for a gate slot for up to GEN_QUEUE_TIMEOUT_MS and then wait out
+        // a full OpenAI timeout; the lock must outlive that and followers should wait as long
+        $queueSeconds = $gate->enabled() ? (int) ceil($gate->timeoutMs() / 1000) : 0;
+        $worstCase = $queueSeconds + OpenAIService::timeoutSeconds() + self::MARGIN_SECONDS;
+        $this->lockSeconds = max(1, (int) env('SINGLE_FLIGHT_LOCK_SECONDS', $worstCase));
+        $this->waitSeconds = max(1, (int) env('SINGLE_FLIGHT_WAIT_SECONDS', $worstCase));
+        $this->resultSeconds = max(1, (int) env('SINGLE_FLIGHT_RESULT_SECONDS', 10));
+    }
+
+    public static function key(string ...$parts): string
+    {
+        return hash('sha256', implode('|', $parts));
+    }
+
+    /**
+     * Run $producer once per key across concurrent requests.
+     *
+     * @return array{0: mixed, 1: bool} the value and whether it was shared from another request
+     */
+    public function run(string $key, callable $producer): array
+    {
+        $resultKey = 'flight:result:' . $key;
+        $lock = Cache::lock('flight:' . $key, $this->lockSeconds);
+
+        if (!$lock->get()) {
+            try {
+                $lock->betweenBlockedAttemptsSleepFor(50)->block($this->waitSeconds);
+            } catch (LockTimeoutException $e) {
+                // Leader is still running past our patience; answer independently
+                $lock = null;
+            }
+            $shared = Cache::get($resultKey);
+            if ($shared !== null) {
+                $lock?->release();
+                return [$shared, true];
+            }
+        }
+
+        try {
+            $value = $producer();
+            Cache::put($resultKey, $value, $this->resultSeconds);
+            return [$value, false];
+        } finally {
+            $lock?->release();
+        }
+    }
+}
@@ -37,9 +37,13 @@
             'database' => env('DB_DATABASE', database_path('database.sqlite')),
             'prefix' => '',
             'foreign_key_constraints' => env('DB_FOREIGN_KEYS', true),
-            'busy_timeout' => null,
-            'journal_mode' => null,
-            'synchronous' => null,
+            // Tuned for concurrent transcript + generate writes: WAL lets readers
+            // proceed during writes, NORMAL sync is durable enough in WAL mode.
+            'busy_timeout' => env('DB_BUSY_TIMEOUT', 5000),
+            'journal_mode' => env('DB_JOURNAL_MODE', 'wal'),
+            'synchronous' => env('DB_SYNCHRONOUS', 'normal'),
+            // Applied by AppServiceProvider on connect (bytes; 0 disables)
+            'mmap_size' => env('DB_MMAP_SIZE', 268435456),
         ],
 
         'mysql' => [
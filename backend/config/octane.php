@@ -0,0 +1,137 @@
+<?php
+
+use Laravel\Octane\Contracts\OperationTerminated;
+use Laravel\Octane\Events\RequestHandled;
+use Laravel\Octane\Events\RequestReceived;
+use Laravel\Octane\Events\RequestTerminated;
+use Laravel\Octane\Events\TaskReceived;
+use Laravel\Octane\Events\TaskTerminated;
+use Laravel\Octane\Events\TickReceived;
+use Laravel\Octane\Events\TickTerminated;
+use Laravel\Octane\Events\WorkerErrorOccurred;
+use Laravel\Octane\Events\WorkerStarting;
+use Laravel\Octane\Events\WorkerStopping;
+use Laravel\Octane\Listeners\CloseMonologHandlers;
+use Laravel\Octane\Listeners\CollectGarbage;
+use Laravel\Octane\Listeners\DisconnectFromDatabases;
+use Laravel\Octane\Listeners\EnsureUploadedFilesAreValid;
+use Laravel\Octane\Listeners\EnsureUploadedFilesCanBeMoved;
+use Laravel\Octane\Listeners\FlushOnce;
+use Laravel\Octane\Listeners\FlushTemporaryContainerInstances;
+use Laravel\Octane\Listeners\ReportException;
+use Laravel\Octane\Listeners\StopWorkerIfNecessary;
+use Laravel\Octane\Octane;
+
+/*
+|--------------------------------------------------------------------------
+| Persistent worker mode (Laravel Octane)
+|--------------------------------------------------------------------------
+|
+| Only used when laravel/octane is installed (see "suggest" in composer.json and the
+| README "Serving with persistent workers" section). Each worker boots the framework
+| once and keeps the services listed under "warm" in memory between requests; the
+| OpenAIService request state is cleared on RequestReceived by AppServiceProvider.
+|
+*/
+
+$octaneInstalled = class_exists(Octane::class);
+
+return [
+
+    'server' => env('OCTANE_SERVER', 'frankenphp'),
+
+    'https' => env('OCTANE_HTTPS', false),
+
+    'listeners' => [
+        WorkerStarting::class => [
+            EnsureUploadedFilesAreValid::class,
+            EnsureUploadedFilesCanBeMoved::class,
+        ],
+
+        RequestReceived::class => [
+            ...($octaneInstalled ? Octane::prepareApplicationForNextOperation() : []),
+            ...($octaneInstalled ? Octane::prepareApplicationForNextRequest() : []),
+        ],
+
+        RequestHandled::class => [
+            //
+        ],
+
+        RequestTerminated::class => [
+            // FlushUploadedFiles::class,
+        ],
+
+        TaskReceived::class => [
+            ...($octaneInstalled ? Octane::prepareApplicationForNextOperation() : []),
+        ],
+
+        TaskTerminated::class => [
+            //
+        ],
+
+        TickReceived::class => [
+            ...($octaneInstalled ? Octane::prepareApplicationForNextOperation() : []),
+        ],
+
+        TickTerminated::class => [
+            //
+        ],
+
+        OperationTerminated::class => [
+            FlushOnce::class,
+            FlushTemporaryContainerInstances::class,
+            // DisconnectFromDatabases::class,
+            // CollectGarbage::class,
+        ],
+
+        WorkerErrorOccurred::class => [
+            ReportException::class,
+            StopWorkerIfNecessary::class,
+        ],
+
+        WorkerStopping::class => [
+            CloseMonologHandlers::class,
+        ],
+    ],
+
+    /*
+    | Resolved once at worker boot and shared by every request the worker serves.
+    | They only hold configuration, the OpenAI client / cURL handle and the persona list.
+    */
+    'warm' => [
+        ...($octaneInstalled ? Octane::defaultServicesToWarm() : []),
+        \App\Services\OpenAIService::class,
+        \App\Services\PromptBuilder::class,
+        \App\Services\PersonaCatalog::class,
+        \App\Services\ModelRouter::class,
+        \App\Services\SingleFlight::class,
+        \App\Services\ConcurrencyGate::class,
+    ],
+
+    'flush' => [
+        //
+    ],
+
+    'tables' => [],
+
+    'cache' => [
+        'rows' => 1000,
+        'bytes' => 10000,
+    ],
+
+    'watch' => [
+        'app',
+        'bootstrap',
+        'config/**/*.php',
+        'database/**/*.php',
+        'routes',
+        'composer.lock',
+        '.env',
+    ],
+
+    'garbage' => 50,
+
+    // Generate calls wait on OpenAI (60 s timeout) plus the concurrency queue
+    'max_execution_time' => (int) env('OCTANE_MAX_EXECUTION_TIME', 90),
+
+];
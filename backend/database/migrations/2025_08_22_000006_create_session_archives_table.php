@@ -0,0 +1,34 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration {
+    public function up(): void
+    {
+        Schema::create('session_archives', function (Blueprint $table) {
+            $table->id();
+            $table->string('session_id', 100);
+            $table->string('kind', 20); // transcript | qa
+            $table->unsignedInteger('row_count')->default(0);
+            $table->timestamp('first_at')->nullable();
+            $table->timestamp('last_at')->nullable();
+            $table->binary('payload'); // gzip-compressed NDJSON rows
+            $table->timestamps();
+            // Append-only: each sessions:compact run adds a segment per session and kind
+            $table->index(['session_id', 'kind']);
+        });
+
+        // BLOB caps out at 64 KB on MySQL; long sessions need LONGBLOB
+        if (in_array(DB::getDriverName(), ['mysql', 'mariadb'], true)) {
+            DB::statement('ALTER TABLE session_archives MODIFY payload LONGBLOB NOT NULL');
+        }
+    }
+
+    public function down(): void
+    {
+        Schema::dropIfExists('session_archives');
+    }
+};
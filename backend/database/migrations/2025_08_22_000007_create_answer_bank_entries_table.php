@@ -0,0 +1,26 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration {
+    public function up(): void
+    {
+        Schema::create('answer_bank_entries', function (Blueprint $table) {
+            $table->id();
+            $table->string('session_id', 100);
+            $table->unsignedBigInteger('persona_id')->nullable();
+            $table->text('question');
+            $table->longText('answer');
+            $table->string('model', 50)->nullable();
+            $table->timestamps();
+            $table->index(['session_id', 'persona_id']);
+        });
+    }
+
+    public function down(): void
+    {
+        Schema::dropIfExists('answer_bank_entries');
+    }
+};
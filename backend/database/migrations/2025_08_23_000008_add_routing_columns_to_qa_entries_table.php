@@ -0,0 +1,25 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration {
+    public function up(): void
+    {
+        Schema::table('qa_entries', function (Blueprint $table) {
+            $table->string('model', 50)->nullable()->after('final_answer');
+            $table->string('route_reason', 30)->nullable()->after('model');
+            $table->float('complexity')->nullable()->after('route_reason');
+            $table->unsignedInteger('ttfb_ms')->nullable()->after('complexity');
+            $table->unsignedInteger('latency_ms')->nullable()->after('ttfb_ms');
+        });
+    }
+
+    public function down(): void
+    {
+        Schema::table('qa_entries', function (Blueprint $table) {
+            $table->dropColumn(['model', 'route_reason', 'complexity', 'ttfb_ms', 'latency_ms']);
+        });
+    }
+};
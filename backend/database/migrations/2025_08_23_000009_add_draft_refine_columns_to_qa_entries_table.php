@@ -0,0 +1,25 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration {
+    public function up(): void
+    {
+        Schema::table('qa_entries', function (Blueprint $table) {
+            $table->longText('draft_answer')->nullable()->after('latency_ms');
+            $table->string('draft_model', 50)->nullable()->after('draft_answer');
+            $table->unsignedInteger('draft_ms')->nullable()->after('draft_model');
+            $table->unsignedInteger('refined_ms')->nullable()->after('draft_ms');
+            $table->boolean('refined_in_time')->nullable()->after('refined_ms');
+        });
+    }
+
+    public function down(): void
+    {
+        Schema::table('qa_entries', function (Blueprint $table) {
+            $table->dropColumn(['draft_answer', 'draft_model', 'draft_ms', 'refined_ms', 'refined_in_time']);
+        });
+    }
+};
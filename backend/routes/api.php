@@ -2,6 +2,7 @@
 
 use Illuminate\Support\Facades\Route;
 use App\Http\Controllers\Api\AiController;
+use App\Http\Controllers\Api\SessionExportController;
 
 Route::get('/health', [AiController::class, 'health']);
 Route::post('/generate-answer', [AiController::class, 'generate']);
@@ -9,3 +10,6 @@
 Route::get('/personas', [AiController::class, 'personas']);
 Route::get('/interview-info', [AiController::class, 'getInterviewInfo']);
 Route::post('/interview-info', [AiController::class, 'upsertInterviewInfo']);
+Route::get('/sessions/export', [SessionExportController::class, 'exportAll']);
+Route::get('/sessions/{sessionId}/export', [SessionExportController::class, 'export']);
+Route::post('/sessions/import', [SessionExportController::class, 'import']);
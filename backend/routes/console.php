@@ -2,7 +2,12 @@
 
 use Illuminate\Foundation\Inspiring;
 use Illuminate\Support\Facades\Artisan;
+use Illuminate\Support\Facades\Schedule;
 
 Artisan::command('inspire', function () {
     $this->comment(Inspiring::quote());
 })->purpose('Display an inspiring quote');
+
+// Merge finished sessions' transcript chunks into compressed archives and apply Q&A retention.
+// Requires the scheduler: `php artisan schedule:work` (dev) or a cron entry for `schedule:run`.
+Schedule::command('sessions:compact')->hourly()->withoutOverlapping();
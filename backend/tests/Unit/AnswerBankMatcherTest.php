@@ -0,0 +1,82 @@
+<?php
+
+namespace Tests\Unit;
+
+use App\Services\AnswerBankMatcher;
+use PHPUnit\Framework\TestCase;
+
+class AnswerBankMatcherTest extends TestCase
+{
+    private const BANK = [
+        'Tell me about yourself.',
+        'What is your experience with Python and Django?',
+        'Why do you want to work at Acme?',
+        'Describe a challenging project you worked on.',
+        'How do you handle conflict in a team?',
+        'What are your greatest strengths and weaknesses?',
+        'Where do you see yourself in five years?',
+        'How would you design a scalable REST API?',
+        'How do you approach code reviews?',
+        'Tell me about a time you missed a deadline.',
+    ];
+
+    private const THRESHOLD = 0.6;
+
+    public function test_paraphrases_of_a_bank_question_match(): void
+    {
+        $matcher = new AnswerBankMatcher();
+
+        [$index, $ratio] = $matcher->best('Okay great. So, could you tell me a bit about yourself?', self::BANK);
+        $this->assertSame(0, $index);
+        $this->assertGreaterThanOrEqual(self::THRESHOLD, $ratio);
+
+        [$index, $ratio] = $matcher->best('Next one. What experience do you have with Django and Python', self::BANK);
+        $this->assertSame(1, $index);
+        $this->assertGreaterThanOrEqual(self::THRESHOLD, $ratio);
+    }
+
+    public function test_question_about_a_different_technology_does_not_match(): void
+    {
+        [, $ratio] = (new AnswerBankMatcher())->best(
+            "Thanks for joining. So we use Python heavily. What's your experience with Go?",
+            self::BANK
+        );
+        $this->assertLessThan(self::THRESHOLD, $ratio);
+    }
+
+    public function test_question_that_only_contains_a_bank_question_does_not_match(): void
+    {
+        [, $ratio] = (new AnswerBankMatcher())->best(
+            'Can you tell me about the team you worked with and yourself in that team?',
+            self::BANK
+        );
+        $this->assertLessThan(self::THRESHOLD, $ratio);
+    }
+
+    public function test_only_the_last_question_of_the_transcript_is_matched(): void
+    {
+        $transcript = "Tell me about yourself?\nI have been a backend developer for six years.\n"
+            . 'Lots of Django and Python there. Where do you see yourself in five years?';
+
+        [$index, $ratio] = (new AnswerBankMatcher())->best($transcript, self::BANK);
+        $this->assertSame(6, $index);
+        $this->assertSame(1.0, $ratio);
+    }
+
+    public function test_last_sentence_is_used_when_there_is_no_question_mark(): void
+    {
+        $matcher = new AnswerBankMatcher();
+
+        $this->assertSame('why do you want to work at Acme', $matcher->lastQuestion("Good.\nwhy do you want to work at Acme"));
+        $this->assertSame('', $matcher->lastQuestion('   '));
+    }
+
+    public function test_empty_inputs_return_no_match(): void
+    {
+        $matcher = new AnswerBankMatcher();
+
+        $this->assertSame([null, 0.0], $matcher->best('', self::BANK));
+        $this->assertSame([null, 0.0], $matcher->best('Tell me about yourself?', []));
+        $this->assertSame([null, 0.0], $matcher->best('What is the weather like?', self::BANK));
+    }
+}
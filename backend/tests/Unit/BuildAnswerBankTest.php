@@ -0,0 +1,52 @@
+<?php
+
+namespace Tests\Unit;
+
+use App\Jobs\BuildAnswerBank;
+use PHPUnit\Framework\TestCase;
+
+class BuildAnswerBankTest extends TestCase
+{
+    private function parse(string $raw): array
+    {
+        return (new BuildAnswerBank('test-session'))->parsePairs($raw);
+    }
+
+    public function test_parses_a_plain_json_list(): void
+    {
+        $pairs = $this->parse('[{"question": "Q1?", "answer": "A1."}, {"question": "Q2?", "answer": "A2."}]');
+
+        $this->assertSame([
+            ['question' => 'Q1?', 'answer' => 'A1.'],
+            ['question' => 'Q2?', 'answer' => 'A2.'],
+        ], $pairs);
+    }
+
+    public function test_strips_code_fences(): void
+    {
+        $pairs = $this->parse("```json\n[{\"question\": \"Q1?\", \"answer\": \"A1.\"}]\n```");
+
+        $this->assertSame([['question' => 'Q1?', 'answer' => 'A1.']], $pairs);
+    }
+
+    public function test_unwraps_an_object_holding_the_list(): void
+    {
+        $pairs = $this->parse('{"questions": [{"question": " Q1? ", "answer": " A1. "}]}');
+
+        $this->assertSame([['question' => 'Q1?', 'answer' => 'A1.']], $pairs);
+    }
+
+    public function test_skips_incomplete_rows(): void
+    {
+        $pairs = $this->parse('[{"question": "Q1?"}, {"answer": "A2."}, "text", {"question": "Q3?", "answer": "A3."}]');
+
+        $this->assertSame([['question' => 'Q3?', 'answer' => 'A3.']], $pairs);
+    }
+
+    public function test_malformed_json_yields_no_pairs(): void
+    {
+        $this->assertSame([], $this->parse('[{"question": "Q1?", "answer": '));
+        $this->assertSame([], $this->parse('Sorry, I cannot help with that.'));
+        $this->assertSame([], $this->parse('{"question": "Q1?", "answer": "A1."}'));
+    }
+}
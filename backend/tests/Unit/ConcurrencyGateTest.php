@@ -0,0 +1,100 @@
+<?php
+
+namespace Tests\Unit;
+
+use App\Services\ConcurrencyGate;
+use Tests\TestCase;
+
+class ConcurrencyGateTest extends TestCase
+{
+    private function state(array $running, array $waiting, float $now = 1000.0): array
+    {
+        $state = ['running' => [], 'waiting' => []];
+        foreach ($running as $id => $session) {
+            $state['running'][$id] = ['session' => $session, 'expires' => $now + 60];
+        }
+        foreach ($waiting as $id => [$session, $since]) {
+            $state['waiting'][$id] = ['session' => $session, 'since' => $since, 'seen' => $now];
+        }
+        return $state;
+    }
+
+    public function test_next_prefers_the_session_with_fewest_running(): void
+    {
+        $gate = new ConcurrencyGate(perSession: 2, global: 4);
+        // "busy" has one generation running and the oldest waiter; "quiet" has none running
+        $state = $this->state(['r1' => 'busy'], ['w1' => ['busy', 1.0], 'w2' => ['quiet', 2.0]]);
+
+        $this->assertSame('w2', $gate->next($state));
+    }
+
+    public function test_next_breaks_ties_by_age(): void
+    {
+        $gate = new ConcurrencyGate(perSession: 2, global: 4);
+        $state = $this->state([], ['w1' => ['a', 3.0], 'w2' => ['b', 1.0], 'w3' => ['c', 2.0]]);
+
+        $this->assertSame('w2', $gate->next($state));
+    }
+
+    public function test_next_respects_per_session_and_global_caps(): void
+    {
+        $gate = new ConcurrencyGate(perSession: 2, global: 3);
+
+        $full = $this->state(['r1' => 'a', 'r2' => 'a'], ['w1' => ['a', 1.0]]);
+        $this->assertNull($gate->next($full));
+
+        $otherSession = $this->state(['r1' => 'a', 'r2' => 'a'], ['w1' => ['a', 1.0], 'w2' => ['b', 2.0]]);
+        $this->assertSame('w2', $gate->next($otherSession));
+
+        $global = $this->state(['r1' => 'a', 'r2' => 'b', 'r3' => 'c'], ['w1' => ['d', 1.0]]);
+        $this->assertNull($gate->next($global));
+    }
+
+    public function test_purge_drops_expired_tickets_and_stale_waiters(): void
+    {
+        $gate = new ConcurrencyGate();
+        $now = 1000.0;
+        $state = [
+            'running' => [
+                'live' => ['session' => 'a', 'expires' => $now + 1],
+                'expired' => ['session' => 'a', 'expires' => $now - 1],
+            ],
+            'waiting' => [
+                'polling' => ['session' => 'b', 'since' => $now - 30, 'seen' => $now - 1],
+                'gone' => ['session' => 'b', 'since' => $now - 30, 'seen' => $now - 60],
+            ],
+        ];
+
+        $purged = $gate->purge($state, $now);
+
+        $this->assertSame(['live'], array_keys($purged['running']));
+        $this->assertSame(['polling'], array_keys($purged['waiting']));
+    }
+
+    public function test_acquire_and_release(): void
+    {
+        $gate = new ConcurrencyGate(perSession: 1, global: 2, timeoutMs: 0);
+
+        $first = $gate->acquire('a');
+        $this->assertNotNull($first);
+        // Session cap reached, but another session still gets a slot
+        $this->assertNull($gate->acquire('a'));
+        $second = $gate->acquire('b');
+        $this->assertNotNull($second);
+        // Global cap reached
+        $this->assertNull($gate->acquire('c'));
+
+        $gate->release($first);
+        $this->assertNotNull($gate->acquire('a'));
+    }
+
+    public function test_expired_tickets_free_their_slot(): void
+    {
+        $gate = new ConcurrencyGate(perSession: 1, global: 0, timeoutMs: 0, ticketSeconds: 1);
+
+        $this->assertNotNull($gate->acquire('a'));
+        $this->assertNull($gate->acquire('a'));
+        usleep(1_100_000);
+        $this->assertNotNull($gate->acquire('a'));
+    }
+}
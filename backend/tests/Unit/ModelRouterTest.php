@@ -0,0 +1,102 @@
+<?php
+
+namespace Tests\Unit;
+
+use App\Services\ModelRouter;
+use Tests\TestCase;
+
+class ModelRouterTest extends TestCase
+{
+    private const SIMPLE = 'Do you have a driving licence?';
+    private const COMPLEX = 'Walk me through how you would design and scale a distributed cache with Redis replication, '
+        . 'explain the consistency tradeoffs, how you would handle a failure of the primary, and why you would '
+        . 'choose sharding over a single node when latency and throughput both matter for the API.';
+
+    public function test_complexity_is_bounded_and_ordered(): void
+    {
+        $router = new ModelRouter();
+
+        $this->assertSame(0.0, $router->complexity(''));
+        $simple = $router->complexity(self::SIMPLE);
+        $complex = $router->complexity(self::COMPLEX);
+        $this->assertGreaterThanOrEqual(0.0, $simple);
+        $this->assertLessThan(0.2, $simple);
+        $this->assertGreaterThan(0.8, $complex);
+        $this->assertLessThanOrEqual(1.0, $complex);
+    }
+
+    public function test_auto_routes_by_complexity(): void
+    {
+        $router = new ModelRouter();
+
+        $simple = $router->route(self::SIMPLE, ModelRouter::AUTO);
+        $this->assertSame($router->fastModel(), $simple['model']);
+        $this->assertSame('simple', $simple['reason']);
+
+        $complex = $router->route(self::COMPLEX, ModelRouter::AUTO);
+        $this->assertSame($router->strongModel(), $complex['model']);
+        $this->assertSame('complex', $complex['reason']);
+    }
+
+    public function test_complex_questions_fall_back_when_the_strong_model_breaks_the_slo(): void
+    {
+        $router = new ModelRouter(sloMs: 6000, minSamples: 5);
+        for ($i = 0; $i < 20; $i++) {
+            $router->record($router->strongModel(), 500, 600000);
+        }
+
+        $route = $router->route(self::COMPLEX, ModelRouter::AUTO);
+        $this->assertSame($router->fastModel(), $route['model']);
+        $this->assertSame('slo_fallback', $route['reason']);
+    }
+
+    public function test_fallback_ends_once_slow_samples_age_out(): void
+    {
+        $router = new ModelRouter(sloMs: 6000, minSamples: 5, maxAgeMinutes: 15);
+        for ($i = 0; $i < 20; $i++) {
+            $router->record($router->strongModel(), 500, 600000);
+        }
+        $this->assertSame('slo_fallback', $router->route(self::COMPLEX, ModelRouter::AUTO)['reason']);
+
+        $this->travel(16)->minutes();
+
+        $this->assertSame(0, $router->stats($router->strongModel())['samples']);
+        $route = $router->route(self::COMPLEX, ModelRouter::AUTO);
+        $this->assertSame([$router->strongModel(), 'complex'], [$route['model'], $route['reason']]);
+
+        // New samples start a fresh window without the stale ones
+        $router->record($router->strongModel(), 300, 2000);
+        $this->assertSame(1, $router->stats($router->strongModel())['samples']);
+    }
+
+    public function test_manual_model_and_retry_upgrade(): void
+    {
+        $router = new ModelRouter();
+
+        $manual = $router->route(self::COMPLEX, 'some-model');
+        $this->assertSame(['some-model', 'manual'], [$manual['model'], $manual['reason']]);
+
+        $retry = $router->route(self::SIMPLE, $router->fastModel(), true);
+        $this->assertSame([$router->strongModel(), 'retry_upgrade'], [$retry['model'], $retry['reason']]);
+
+        // Already on the strong model: a retry keeps it as a manual choice
+        $strong = $router->route(self::SIMPLE, $router->strongModel(), true);
+        $this->assertSame('manual', $strong['reason']);
+    }
+
+    public function test_record_keeps_a_bounded_window_and_reports_percentiles(): void
+    {
+        $router = new ModelRouter(window: 50);
+        $this->assertSame(['samples' => 0, 'ttfb_p50_ms' => null, 'latency_p50_ms' => null, 'latency_p95_ms' => null], $router->stats('m'));
+
+        for ($i = 1; $i <= 200; $i++) {
+            $router->record('m', $i % 2 ? null : 100.0, $i * 10.0);
+        }
+        $stats = $router->stats('m');
+
+        $this->assertSame(50, $stats['samples']);
+        $this->assertSame(100, $stats['ttfb_p50_ms']);
+        // The window holds the 50 most recent samples (latencies 1510 .. 2000); p95 is the 48th
+        $this->assertSame(1980, $stats['latency_p95_ms']);
+    }
+}
@@ -0,0 +1,48 @@
+<?php
+
+namespace Tests\Unit;
+
+use App\Models\SessionArchive;
+use Tests\TestCase;
+
+class SessionArchiveTest extends TestCase
+{
+    public function test_rows_round_trip_through_the_payload(): void
+    {
+        $rows = [
+            ['text' => 'First chunk', 'source' => 'system', 'created_at' => '2025-08-22T10:00:00+00:00'],
+            ['text' => "Unicode — naïve, \"quoted\"\nand multi-line", 'source' => null, 'created_at' => null],
+        ];
+
+        $archive = new SessionArchive(['payload' => SessionArchive::encodeRows($rows)]);
+
+        $this->assertSame($rows, $archive->rows());
+    }
+
+    public function test_payload_is_plain_gzip(): void
+    {
+        $payload = SessionArchive::encodeRows([['a' => 1], ['b' => 2]]);
+
+        $this->assertSame("{\"a\":1}\n{\"b\":2}\n", gzdecode($payload));
+    }
+
+    public function test_generators_are_encoded(): void
+    {
+        $rows = (function () {
+            for ($i = 0; $i < 1000; $i++) {
+                yield ['i' => $i];
+            }
+        })();
+
+        $decoded = (new SessionArchive(['payload' => SessionArchive::encodeRows($rows)]))->rows();
+
+        $this->assertCount(1000, $decoded);
+        $this->assertSame(['i' => 999], $decoded[999]);
+    }
+
+    public function test_empty_payload_decodes_to_no_rows(): void
+    {
+        $this->assertSame([], (new SessionArchive(['payload' => SessionArchive::encodeRows([])]))->rows());
+        $this->assertSame([], (new SessionArchive(['payload' => '']))->rows());
+    }
+}
@@ -0,0 +1,181 @@
+"""Capture-independent audio pipeline: mono mix, resampling to 16 kHz, VAD segmentation.
+
+Qt-free so it can be driven headless (soak tests, the STT server). The per-block path reuses
+preallocated scratch buffers and the segmenter writes into a fixed-size buffer, so a
+long session allocates nothing per block beyond what VAD/STT need.
+"""
+from typing import Optional
+
+import numpy as np
+
+SR_TARGET = 16000
+
+
+class BlockProcessor:
+    """Mix capture blocks to mono and bring them to 16 kHz using reusable buffers.
+
+    The returned array is a view into an internal buffer and is only valid until the
+    next call; callers that keep audio (the segmenter) copy it.
+    """
+
+    def __init__(self):
+        self._mono = np.empty((0,), dtype=np.float32)
+        self._out = np.empty((0,), dtype=np.float32)
+        # Cached interpolation grids for the generic resampler, keyed by (n_in, sr_in)
+        self._grid_key = None
+        self._xp = None
+        self._x_new = None
+
+    @staticmethod
+    def _ensure(buf: np.ndarray, n: int) -> np.ndarray:
+        return buf if buf.shape[0] >= n else np.empty((max(n, buf.shape[0] * 2),), dtype=np.float32)
+
+    def process(self, block: np.ndarray, sr_in: int) -> np.ndarray:
+        n = block.shape[0]
+        if n == 0:
+            return self._out[:0]
+        # Mix to mono robustly (handle 1D or 2D input)
+        self._mono = self._ensure(self._mono, n)
+        mono = self._mono[:n]
+        if getattr(block, "ndim", 1) == 1:
+            np.copyto(mono, block, casting="same_kind")
+        else:
+            # Channel-wise adds instead of mean(axis=1), which allocates a reduction buffer
+            channels = block.shape[1]
+            np.copyto(mono, block[:, 0], casting="same_kind")
+            for c in range(1, channels):
+                np.add(mono, block[:, c], out=mono, casting="same_kind")
+            if channels > 1:
+                mono *= 1.0 / channels
+
+        if sr_in == SR_TARGET:
+            return mono
+        if sr_in == 48000:
+            m = n // 3
+            self._out = self._ensure(self._out, m)
+            out = self._out[:m]
+            frames = mono[: m * 3].reshape(-1, 3)
+            np.add(frames[:, 0], frames[:, 1], out=out)
+            np.add(out, frames[:, 2], out=out)
+            out *= 1.0 / 3.0
+            return out
+
+        key = (n, sr_in)
+        if key != self._grid_key:
+            duration = n / float(sr_in)
+            n_out = max(1, int(round(duration * SR_TARGET)))
+            self._xp = np.linspace(0.0, duration, num=n, endpoint=False, dtype=np.float64)
+            self._x_new = np.linspace(0.0, duration, num=n_out, endpoint=False, dtype=np.float64)
+            self._grid_key = key
+        m = self._x_new.shape[0]
+        self._out = self._ensure(self._out, m)
+        out = self._out[:m]
+        # np.interp has no out=; this is the one remaining per-block temporary on this path
+        np.copyto(out, np.interp(self._x_new, self._xp, mono), casting="same_kind")
+        return out
+
+
+class SpeechSegmenter:
+    """Group 16 kHz blocks into speech segments using WebRTC VAD or an energy fallback.
+
+    A segment starts after `start_margin` consecutive speech blocks and ends after
+    `end_margin` non-speech blocks. Speech is accumulated in a preallocated buffer of
+    `max_segment_s` seconds; a segment that fills it is emitted early rather than grown,
+    and the speech that follows carries straight on into the next segment.
+    """
+
+    def __init__(self, vad=None, energy_threshold: float = 0.01, start_margin: int = 3,
+                 end_margin: int = 8, max_segment_s: float = 30.0):
+        self.vad = vad
+        self.energy_threshold = float(energy_threshold)
+        self.start_margin = start_margin
+        self.end_margin = end_margin
+        self._buf = np.empty((int(max_segment_s * SR_TARGET),), dtype=np.float32)
+        self._pcm = np.empty((0,), dtype=np.int16)
+        self._scaled = np.empty((0,), dtype=np.float32)
+        self._len = 0
+        self.active = False
+        self._consecutive_speech = 0
+        self._non_speech = 0
+
+    def is_speech(self, mono_16k: np.ndarray) -> bool:
+        if self.vad is not None:
+            n = mono_16k.shape[0]
+            if self._pcm.shape[0] < n:
+                self._pcm = np.empty((n,), dtype=np.int16)
+                self._scaled = np.empty((n,), dtype=np.float32)
+            pcm = self._pcm[:n]
+            scaled = self._scaled[:n]
+            np.clip(mono_16k, -1.0, 1.0, out=scaled)
+            scaled *= 32767.0
+            np.copyto(pcm, scaled, casting="unsafe")
+            # Blocks are ~10-30 ms; webrtcvad accepts 10/20/30 ms frames
+            try:
+                return bool(self.vad.is_speech(pcm.tobytes(), SR_TARGET))
+            except Exception:
+                return False
+        # Simple energy-based fallback (dot product avoids a squared temporary)
+        n = mono_16k.shape[0]
+        return n > 0 and float(np.sqrt(np.dot(mono_16k, mono_16k) / n)) > self.energy_threshold
+
+    def _append(self, mono_16k: np.ndarray) -> Optional[np.ndarray]:
+        n = min(mono_16k.shape[0], self._buf.shape[0] - self._len)
+        self._buf[self._len:self._len + n] = mono_16k[:n]
+        self._len += n
+        if self._len >= self._buf.shape[0]:
+            audio = self._finish()
+            # The part of the block that didn't fit starts the next segment
+            rest = mono_16k[n:n + self._buf.shape[0]]
+            if rest.shape[0]:
+                self._buf[: rest.shape[0]] = rest
+                self._len = rest.shape[0]
+                self.active = True
+            return audio
+        return None
+
+    def _finish(self) -> np.ndarray:
+        audio = self._buf[: self._len].copy()
+        self._len = 0
+        self._non_speech = 0
+        self.active = False
+        return audio
+
+    def flush(self) -> Optional[np.ndarray]:
+        """End of stream: return the in-progress segment, if any."""
+        self._consecutive_speech = 0
+        if self.active and self._len:
+            return self._finish()
+        self.active = False
+        return None
+
+    def feed(self, mono_16k: np.ndarray) -> Optional[np.ndarray]:
+        """Consume one block; return a finished segment (an owned copy) or None."""
+        if mono_16k.size == 0:
+            return None
+        if self.is_speech(mono_16k):
+            self._consecutive_speech += 1
+            self._non_speech = 0
+            if not self.active and self._consecutive_speech >= self.start_margin:
+                self.active = True
+                self._len = 0
+            if self.active:
+                return self._append(mono_16k)
+            return None
+        self._consecutive_speech = 0
+        if self.active:
+            self._non_speech += 1
+            if self._non_speech >= self.end_margin:
+                return self._finish()
+        return None
+
+
+def make_vad(level: int = 2):
+    """WebRTC VAD at the given aggressiveness, or None (energy fallback) if unavailable."""
+    try:
+        import webrtcvad  # type: ignore
+    except Exception:
+        return None
+    try:
+        return webrtcvad.Vad(max(0, min(3, int(level))))
+    except Exception:
+        return None
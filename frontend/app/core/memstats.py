@@ -0,0 +1,169 @@
+"""Process memory and GC instrumentation shared by the soak runner and the app's memory panel."""
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict, Optional
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None if it can't be determined."""
+    try:
+        import psutil  # type: ignore
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        pass
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "rb") as fh:
+                return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except Exception:
+            return None
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _PMC(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            pmc = _PMC()
+            pmc.cb = ctypes.sizeof(_PMC)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(pmc), pmc.cb):
+                return int(pmc.WorkingSetSize)
+        except Exception:
+            return None
+    return None
+
+
+def format_mb(n: Optional[float]) -> str:
+    return "n/a" if n is None else f"{n / 1048576:.1f} MB"
+
+
+class StageStats:
+    __slots__ = ("calls", "seconds", "alloc_bytes", "gc_pauses", "gc_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.alloc_bytes = 0
+        self.gc_pauses = 0
+        self.gc_seconds = 0.0
+
+
+class StageProfiler:
+    """Per-stage wall time, allocated bytes and GC pauses.
+
+    Allocation volume is measured with tracemalloc's peak counter (reset before each
+    stage), so it counts bytes allocated inside the stage even if freed again, which is
+    what "allocations per second" needs. GC pauses are attributed to whichever stage was
+    running when the collector fired. Only one thread should drive a profiler.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self._current: Optional[str] = None
+        self._gc_started = 0.0
+        self.gc_pauses = 0
+        self.gc_seconds = 0.0
+        self.gc_max_seconds = 0.0
+        self._installed = False
+
+    def install(self) -> None:
+        if not self._installed:
+            gc.callbacks.append(self._on_gc)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        if self._installed:
+            try:
+                gc.callbacks.remove(self._on_gc)
+            except ValueError:
+                pass
+            self._installed = False
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+            return
+        pause = time.perf_counter() - self._gc_started
+        self.gc_pauses += 1
+        self.gc_seconds += pause
+        self.gc_max_seconds = max(self.gc_max_seconds, pause)
+        if self._current is not None:
+            st = self.stages[self._current]
+            st.gc_pauses += 1
+            st.gc_seconds += pause
+
+    def stage(self, name: str) -> "_StageTimer":
+        if name not in self.stages:
+            self.stages[name] = StageStats()
+        return _StageTimer(self, name)
+
+
+class _StageTimer:
+    __slots__ = ("p", "name", "t0", "mem0")
+
+    def __init__(self, profiler: StageProfiler, name: str):
+        self.p = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.p._current = self.name
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.mem0 = tracemalloc.get_traced_memory()[0]
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        st = self.p.stages[self.name]
+        st.calls += 1
+        st.seconds += elapsed
+        if tracemalloc.is_tracing():
+            st.alloc_bytes += max(0, tracemalloc.get_traced_memory()[1] - self.mem0)
+        self.p._current = None
+        return False
+
+
+class GcPauseMonitor:
+    """Thread-safe running total of GC pauses, for the app's memory panel."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._t0 = 0.0
+        self.pauses = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._t0 = time.perf_counter()
+            return
+        pause = time.perf_counter() - self._t0
+        with self._lock:
+            self.pauses += 1
+            self.total_seconds += pause
+            self.max_seconds = max(self.max_seconds, pause)
+
+    def close(self) -> None:
+        try:
+            gc.callbacks.remove(self._on_gc)
+        except ValueError:
+            pass
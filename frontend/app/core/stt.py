@@ -0,0 +1,44 @@
+"""On-device speech-to-text via faster-whisper (optional dependency)."""
+import os
+from typing import List, Optional
+
+import numpy as np
+
+
+class WhisperSTT:
+    def __init__(self, model_name: Optional[str] = None):
+        try:
+            from faster_whisper import WhisperModel  # type: ignore
+        except Exception:
+            self.model = None
+            return
+        # Choose a small, fast, free model
+        model_name = model_name or os.getenv("WHISPER_MODEL", "tiny.en")
+        try:
+            # Use CPU-friendly compute type
+            self.model = WhisperModel(model_name, device="cpu", compute_type="int8")
+        except Exception:
+            self.model = None
+
+    def available(self) -> bool:
+        return self.model is not None
+
+    def transcribe(self, audio_16k_f32: np.ndarray) -> str:
+        if not self.model or audio_16k_f32.size == 0:
+            return ""
+        try:
+            segments, _ = self.model.transcribe(audio_16k_f32, language="en")
+            texts: List[str] = []
+            for seg in segments:
+                t = getattr(seg, "text", "")
+                if t:
+                    texts.append(t.strip())
+            return " ".join(texts).strip()
+        except Exception:
+            return ""
+
+
+def placeholder_text(audio_16k_f32: np.ndarray) -> str:
+    """What the UI shows for a segment when no STT is installed."""
+    dur = audio_16k_f32.shape[0] / 16000.0 if audio_16k_f32.size else 0.0
+    return f"[Audio segment ~{dur:.1f}s]"
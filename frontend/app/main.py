@@ -4,7 +4,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 import hashlib
 
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QThread, Signal, QTimer
+from PySide6.QtGui import QTextCursor
  # (Tray icon removed)
 from PySide6.QtWidgets import (
     QApplication,
@@ -35,6 +36,13 @@ try:
 except Exception:
     BackendClient = None  # type: ignore
 
+try:
+    from .services.answerer import AnswerThread
+except Exception:
+    AnswerThread = None  # type: ignore
+
+from .core.memstats import GcPauseMonitor, format_mb, rss_bytes
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -51,11 +59,22 @@ class MainWindow(QMainWindow):
         self.model_id = None
         self.models = []
         self.last_prompt_hash = None
+        self._pending_hash = None
+        # Transcript lines that arrived after the last submit (kept by "Clear after answer")
+        self._lines_since_submit = 0
+        self.answer_thread = None
         # Stealth mode removed
 
         # UI
         self.transcript_view = QTextEdit()
         self.transcript_view.setReadOnly(True)
+        # Cap the live transcript so multi-hour sessions don't grow the document unbounded
+        try:
+            self.transcript_max_lines = int(os.getenv("TRANSCRIPT_MAX_LINES", "500"))
+        except Exception:
+            self.transcript_max_lines = 500
+        if self.transcript_max_lines > 0:
+            self.transcript_view.document().setMaximumBlockCount(self.transcript_max_lines)
         self.answer_view = QTextEdit()
 
         self.status_label = QLabel("Idle")
@@ -68,6 +87,14 @@ class MainWindow(QMainWindow):
         self.btn_reset = QPushButton("Reset Transcript")
         self.chk_clear_after = QCheckBox("Clear after answer")
         self.chk_clear_after.setChecked(True)
+        self.chk_memory = QCheckBox("Show memory stats")
+        self.chk_memory.setToolTip("Live process memory (RSS), GC pauses and transcript size, refreshed every 2s")
+        self.memory_label = QLabel("")
+        self.memory_label.setVisible(False)
+        self.memory_timer = QTimer(self)
+        self.memory_timer.setInterval(2000)
+        self.gc_monitor = None
+        self.rss_start = None
 
         # Interview metadata inputs
         self.persona_combo = QComboBox()
@@ -159,6 +186,8 @@ class MainWindow(QMainWindow):
         row.addWidget(self.btn_reset)
         top.addLayout(row)
         top.addWidget(self.chk_clear_after)
+        top.addWidget(self.chk_memory)
+        top.addWidget(self.memory_label)
         top.addWidget(self.status_label)
 
         container = QWidget()
@@ -179,6 +208,8 @@ class MainWindow(QMainWindow):
         self.model_combo.currentIndexChanged.connect(self.on_model_changed)
         self.model_help.clicked.connect(self.show_model_help)
         self.btn_refresh_devices.clicked.connect(self.refresh_devices)
+        self.chk_memory.toggled.connect(self.toggle_memory_panel)
+        self.memory_timer.timeout.connect(self.update_memory_panel)
 
         # Backend client
         base_url = os.getenv("BACKEND_BASE_URL", "http://127.0.0.1:8000")
@@ -194,6 +225,8 @@ class MainWindow(QMainWindow):
         self.update_context_counter()
         # populate audio devices
         self.refresh_devices()
+        if os.getenv("MEMORY_PANEL", "").strip().lower() in ("1", "true", "yes"):
+            self.chk_memory.setChecked(True)
 
     # Stealth toggle removed
 
@@ -227,6 +260,7 @@ class MainWindow(QMainWindow):
         if not text:
             return
         self.transcript_view.append(text)
+        self._lines_since_submit += 1
         # Any new text invalidates the last submitted hash
         self.last_prompt_hash = None
         # Optionally post to backend for persistence
@@ -246,26 +280,87 @@ class MainWindow(QMainWindow):
             h = hashlib.sha256(question.encode("utf-8")).hexdigest()
         except Exception:
             h = None
+        retry = False
         if self.last_prompt_hash and h and h == self.last_prompt_hash:
-            QMessageBox.information(self, "Already answered", "This transcript was already answered. Add new content or Reset.")
-            return
+            choice = QMessageBox.question(
+                self,
+                "Already answered",
+                "This transcript was already answered.\nRetry with the stronger model?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if choice != QMessageBox.Yes:
+                return
+            retry = True
         self.status_label.setText("Generating answer...")
-        answer = None
-        if self.backend:
-            try:
-                answer = self.backend.generate_answer(question, self.persona_id, self.model_id)
-            except Exception as e:
-                answer = None
+        self._pending_hash = h
+        self._lines_since_submit = 0
+        if not self.backend or AnswerThread is None:
+            self.on_answer_finished("", {})
+            return
+        # Generate off the UI thread; Submit stays disabled until the answer is final
+        draft_refine = self.model_id == "draft_refine"
+        self.btn_submit.setEnabled(False)
+        self.answer_thread = AnswerThread(
+            self.backend,
+            question,
+            self.persona_id,
+            None if draft_refine else self.model_id,
+            retry=retry,
+            draft_refine=draft_refine,
+        )
+        self.answer_thread.draftReady.connect(self.on_answer_draft)
+        self.answer_thread.refinedReady.connect(self.on_answer_refined)
+        self.answer_thread.answerFinished.connect(self.on_answer_finished)
+        self.answer_thread.start()
+
+    def on_answer_draft(self, text: str):
+        if text:
+            self.answer_view.setPlainText(text)
+            self.btn_copy.setEnabled(True)
+            self.status_label.setText("Draft shown - refining...")
+
+    def on_answer_refined(self, text: str):
+        if text:
+            self.answer_view.setPlainText(text)
+            self.btn_copy.setEnabled(True)
+
+    def on_answer_finished(self, answer: str, meta: dict):
+        self.btn_submit.setEnabled(True)
+        meta = meta or {}
         if not answer:
             answer = "[Backend not running yet] This is a placeholder answer."
         self.answer_view.setPlainText(answer)
         self.btn_copy.setEnabled(True)
-        # Remember the last answered prompt hash
-        self.last_prompt_hash = h
-        # Auto-clear transcript if enabled
-        if self.chk_clear_after.isChecked():
-            self.reset_transcript()
-        self.status_label.setText("Ready")
+        # Remember the last answered prompt hash and auto-clear the transcript if enabled;
+        # a busy rejection or failed generation answered nothing, so the question stays on
+        # screen for a resubmit
+        if meta.get("source") not in ("busy", "error"):
+            self.last_prompt_hash = self._pending_hash
+            if self.chk_clear_after.isChecked():
+                self.clear_answered_transcript()
+        self.status_label.setText(self._answer_status(meta))
+
+    @staticmethod
+    def _answer_status(meta: dict) -> str:
+        """Status line after an answer, e.g. "Ready - gpt-4o (complex), 2.1 s"."""
+        kept = meta.get("kept")
+        if kept in ("draft", "refined"):
+            # Draft/refine: report which answer stayed on screen
+            meta = {
+                "model": meta.get(f"{kept}_model"),
+                "latency_ms": meta.get(f"{kept}_ms"),
+                "route_reason": "refined in time" if kept == "refined" and meta.get("refined_in_time")
+                else ("refined" if kept == "refined" else "draft kept, refine missed deadline"),
+            }
+        model = meta.get("model")
+        if not model:
+            return "Ready"
+        detail = meta.get("route_reason") or meta.get("source") or ""
+        text = f"Ready - {model}" + (f" ({detail})" if detail else "")
+        if meta.get("latency_ms"):
+            text += f", {meta['latency_ms'] / 1000:.1f} s"
+        return text
 
     def copy_answer(self):
         text = self.answer_view.toPlainText()
@@ -280,6 +375,57 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+    def clear_answered_transcript(self):
+        """Clear the submitted transcript but keep lines that arrived while the answer was
+        being generated, so the next question isn't lost."""
+        keep = self._lines_since_submit
+        if keep <= 0:
+            self.reset_transcript()
+            return
+        try:
+            doc = self.transcript_view.document()
+            first_kept = doc.findBlockByNumber(max(0, doc.blockCount() - keep))
+            cursor = QTextCursor(doc)
+            cursor.setPosition(first_kept.position(), QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+            self.last_prompt_hash = None
+            self.status_label.setText("Transcript cleared")
+        except Exception:
+            pass
+
+    def toggle_memory_panel(self, enabled: bool):
+        """Show/hide the live memory panel; GC pause tracking only runs while it is visible."""
+        self.memory_label.setVisible(enabled)
+        if enabled:
+            if self.gc_monitor is None:
+                self.gc_monitor = GcPauseMonitor()
+            if self.rss_start is None:
+                self.rss_start = rss_bytes()
+            self.update_memory_panel()
+            self.memory_timer.start()
+        else:
+            self.memory_timer.stop()
+            if self.gc_monitor is not None:
+                self.gc_monitor.close()
+                self.gc_monitor = None
+
+    def update_memory_panel(self):
+        try:
+            rss = rss_bytes()
+            delta = (rss - self.rss_start) if (rss is not None and self.rss_start is not None) else None
+            gcm = self.gc_monitor
+            gc_text = (
+                f"GC {gcm.pauses} pauses, {gcm.total_seconds * 1000:.0f} ms total, max {gcm.max_seconds * 1000:.1f} ms"
+                if gcm else "GC n/a"
+            )
+            sign = "+" if (delta or 0) >= 0 else "-"
+            self.memory_label.setText(
+                f"RSS {format_mb(rss)} ({sign}{format_mb(abs(delta)) if delta is not None else 'n/a'} since shown) | "
+                f"{gc_text} | transcript {self.transcript_view.document().blockCount():,} lines"
+            )
+        except Exception:
+            pass
+
     def update_context_counter(self):
         """Update the Interview Notes character counter and warn when exceeding soft limit."""
         try:
@@ -316,7 +462,7 @@ class MainWindow(QMainWindow):
         ok = False
         if self.backend:
             try:
-                ok = self.backend.upsert_interview_info(company or None, role or None, context or None)
+                ok = self.backend.upsert_interview_info(company or None, role or None, context or None, self.persona_id)
             except Exception:
                 ok = False
         self.status_label.setText("Info saved" if ok else "Save failed")
@@ -352,12 +498,18 @@ class MainWindow(QMainWindow):
             pass
     def closeEvent(self, event):
         """Ensure background threads are stopped cleanly on window close."""
+        self.memory_timer.stop()
         try:
             if self.transcriber and self.transcriber.isRunning():
                 self.transcriber.stop()
                 self.transcriber.wait(2000)
         except Exception:
             pass
+        try:
+            if self.answer_thread and self.answer_thread.isRunning():
+                self.answer_thread.wait(2000)
+        except Exception:
+            pass
         event.accept()
 
     def refresh_devices(self):
@@ -427,6 +579,20 @@ class MainWindow(QMainWindow):
                     "pros": ["Best quality in 4o family"],
                     "cons": ["Higher latency", "Higher cost"],
                 },
+                {
+                    "id": "draft_refine",
+                    "name": "draft + refine (mini, then 4o)",
+                    "tooltip": "Shows a gpt-4o-mini draft immediately and swaps in the gpt-4o answer if it arrives before the backend's deadline.",
+                    "pros": ["Fast first answer", "Higher quality when time allows"],
+                    "cons": ["Two model calls per question", "Answer text may change while you read"],
+                },
+                {
+                    "id": "auto",
+                    "name": "auto (route per question)",
+                    "tooltip": "Backend picks gpt-4o-mini or gpt-4o per question from its complexity and recent latency.",
+                    "pros": ["Fast model for quick questions", "Stronger model for design/technical ones", "Respects the latency SLO"],
+                    "cons": ["Occasional slower answers on complex questions"],
+                },
             ]
             self.model_combo.clear()
             for m in self.models:
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from PySide6.QtCore import QThread, Signal
+
+
+class AnswerThread(QThread):
+    """Fetch an answer from the backend without blocking the UI.
+
+    In draft/refine mode `draftReady` fires as soon as the fast model answers and
+    `refinedReady` replaces it if the stronger model makes the backend's deadline.
+    `answerFinished` always fires last with the answer to keep and the response metadata.
+    """
+
+    draftReady = Signal(str)
+    refinedReady = Signal(str)
+    answerFinished = Signal(str, object)
+
+    def __init__(self, backend, prompt: str, persona_id: Optional[int], model: Optional[str],
+                 retry: bool = False, draft_refine: bool = False):
+        super().__init__()
+        self.backend = backend
+        self.prompt = prompt
+        self.persona_id = persona_id
+        self.model = model
+        self.retry = retry
+        self.draft_refine = draft_refine
+
+    def _on_event(self, event: dict) -> None:
+        kind = event.get("type")
+        if kind == "draft":
+            self.draftReady.emit(event.get("answer", "") or "")
+        elif kind == "refined":
+            self.refinedReady.emit(event.get("answer", "") or "")
+
+    def run(self):
+        answer, meta = "", {}
+        try:
+            if self.draft_refine:
+                answer, meta = self.backend.stream_answer(self.prompt, self.persona_id, self._on_event, retry=self.retry)
+            else:
+                answer = self.backend.generate_answer(self.prompt, self.persona_id, self.model, retry=self.retry)
+                meta = dict(self.backend.last_answer_meta)
+        except Exception:
+            pass
+        self.answerFinished.emit(answer, meta)
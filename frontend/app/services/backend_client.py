@@ -1,6 +1,7 @@
+import json
 import os
 import time
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
 import requests
 
@@ -9,6 +10,8 @@ class BackendClient:
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip("/")
         self.session_id: Optional[str] = None
+        # Metadata of the last generate-answer response (source, model, route_reason, latency_ms, ...)
+        self.last_answer_meta: dict = {}
 
     def ensure_session(self):
         if not self.session_id:
@@ -27,20 +30,88 @@ class BackendClient:
         except Exception:
             pass
 
-    def generate_answer(self, prompt: str, persona_id: Optional[int], model: Optional[str] = None) -> str:
+    def generate_answer(self, prompt: str, persona_id: Optional[int], model: Optional[str] = None, retry: bool = False) -> str:
+        """Ask the backend for an answer. `model` may be "auto" to let the backend route;
+        `retry` requests a fresh answer (upgraded to the stronger model when routing allows)."""
         sid = self.ensure_session()
+        self.last_answer_meta = {}
         try:
             r = requests.post(
                 f"{self.base_url}/api/generate-answer",
-                json={"session_id": sid, "persona_id": persona_id, "prompt": prompt, "model": model},
+                # Explicit mode so a backend ANSWER_MODE default can't switch this call to NDJSON
+                json={"session_id": sid, "persona_id": persona_id, "prompt": prompt, "model": model, "retry": retry,
+                      "mode": "single"},
                 timeout=60,
             )
+            if r.status_code == 429:
+                # Backend concurrency limit: too many answers in flight for this session
+                wait = r.headers.get("Retry-After", "a few")
+                self.last_answer_meta = {"source": "busy"}
+                return f"[Busy] The backend is still answering earlier questions. Try again in {wait} s."
             r.raise_for_status()
             data = r.json()
+            self.last_answer_meta = {k: v for k, v in data.items() if k != "answer"}
             return data.get("answer", "") or ""
         except Exception:
             return ""
 
+    def stream_answer(
+        self,
+        prompt: str,
+        persona_id: Optional[int],
+        on_event: Callable[[dict], None],
+        retry: bool = False,
+    ) -> Tuple[str, dict]:
+        """Draft-then-refine generation. Calls `on_event` for each NDJSON event
+        ({"type": "draft" | "refined" | "done" | "error", ...}) as it arrives and returns
+        the answer to keep plus response metadata. Cache/answer-bank hits come back as plain
+        JSON and are reported as a single "refined" event."""
+        sid = self.ensure_session()
+        self.last_answer_meta = {}
+        shown = ""
+        meta: dict = {"mode": "draft_refine"}
+        try:
+            with requests.post(
+                f"{self.base_url}/api/generate-answer",
+                json={"session_id": sid, "persona_id": persona_id, "prompt": prompt, "mode": "draft_refine", "retry": retry},
+                headers={"Accept": "application/x-ndjson, application/json"},
+                timeout=(10, 60),
+                stream=True,
+            ) as r:
+                if r.status_code == 429:
+                    wait = r.headers.get("Retry-After", "a few")
+                    self.last_answer_meta = {"source": "busy"}
+                    return f"[Busy] The backend is still answering earlier questions. Try again in {wait} s.", self.last_answer_meta
+                r.raise_for_status()
+                if "ndjson" not in r.headers.get("Content-Type", ""):
+                    data = r.json()
+                    shown = data.get("answer", "") or ""
+                    meta.update({k: v for k, v in data.items() if k != "answer"})
+                    on_event({"type": "refined", "answer": shown})
+                else:
+                    for line in r.iter_lines(chunk_size=None, decode_unicode=True):
+                        if not line:
+                            continue
+                        event = json.loads(line)
+                        on_event(event)
+                        kind = event.get("type")
+                        if kind in ("draft", "refined"):
+                            shown = event.get("answer", "") or ""
+                            meta[f"{kind}_model"] = event.get("model")
+                            meta[f"{kind}_ms"] = event.get("latency_ms")
+                        elif kind == "done":
+                            meta.update({"kept": event.get("kept"), "refined_in_time": event.get("refined_in_time")})
+                            # The server may keep running to record a late refined answer; stop here
+                            break
+                        elif kind == "error":
+                            shown = f"[Error] {event.get('message') or 'Answer generation failed'}"
+                            meta["source"] = "error"
+                            break
+        except Exception:
+            pass
+        self.last_answer_meta = meta
+        return shown, meta
+
     # Personas
     def get_personas(self):
         try:
@@ -60,7 +131,7 @@ class BackendClient:
         except Exception:
             return None
 
-    def upsert_interview_info(self, company: Optional[str], role: Optional[str], context: Optional[str]):
+    def upsert_interview_info(self, company: Optional[str], role: Optional[str], context: Optional[str], persona_id: Optional[int] = None):
         sid = self.ensure_session()
         try:
             r = requests.post(
@@ -70,6 +141,8 @@ class BackendClient:
                     "company": company or None,
                     "role": role or None,
                     "context": context or None,
+                    # Persona used to style the pre-generated answer bank
+                    "persona_id": persona_id,
                 },
                 timeout=15,
             )
@@ -6,6 +6,9 @@ from typing import Optional, List
 import numpy as np
 from PySide6.QtCore import QThread, Signal
 
+from ..core.audio import BlockProcessor, SpeechSegmenter, make_vad
+from ..core.stt import WhisperSTT, placeholder_text
+
 # NumPy 2.x compatibility: some dependencies still call np.fromstring in binary mode,
 # which was removed in NumPy 2.x. Patch to transparently use frombuffer for bytes.
 try:
@@ -39,72 +42,6 @@ except Exception:
     pass
 
 
-def _downsample_mono_48k_to_16k(x: np.ndarray) -> np.ndarray:
-    """Downsample 48k float32 mono [-1,1] to 16k float32 by simple decimation.
-    Assumes len divisible by 3; otherwise trims the remainder.
-    """
-    if x.ndim > 1:
-        x = x.mean(axis=1)
-    n = (x.shape[0] // 3) * 3
-    if n <= 0:
-        return np.empty((0,), dtype=np.float32)
-    y = x[:n].reshape(-1, 3).mean(axis=1)
-    return y.astype(np.float32, copy=False)
-
-
-def _float32_to_pcm16(x: np.ndarray) -> bytes:
-    x = np.clip(x, -1.0, 1.0)
-    x = (x * 32767.0).astype(np.int16)
-    return x.tobytes()
-
-
-def _resample_linear(x: np.ndarray, sr_in: int, sr_out: int) -> np.ndarray:
-    """Simple linear resampler to sr_out. x is 1D float32 in [-1,1]."""
-    if sr_in == sr_out or x.size == 0:
-        return x.astype(np.float32, copy=False)
-    # Generate output time indices
-    duration = x.shape[0] / float(sr_in)
-    n_out = max(1, int(round(duration * sr_out)))
-    xp = np.linspace(0.0, duration, num=x.shape[0], endpoint=False, dtype=np.float64)
-    fp = x.astype(np.float32, copy=False)
-    x_new = np.linspace(0.0, duration, num=n_out, endpoint=False, dtype=np.float64)
-    y = np.interp(x_new, xp, fp).astype(np.float32, copy=False)
-    return y
-
-
-class _WhisperSTT:
-    def __init__(self):
-        try:
-            from faster_whisper import WhisperModel  # type: ignore
-        except Exception:
-            self.model = None
-            return
-        # Choose a small, fast, free model
-        model_name = os.getenv("WHISPER_MODEL", "tiny.en")
-        try:
-            # Use CPU-friendly compute type
-            self.model = WhisperModel(model_name, device="cpu", compute_type="int8")
-        except Exception:
-            self.model = None
-
-    def available(self) -> bool:
-        return self.model is not None
-
-    def transcribe(self, audio_16k_f32: np.ndarray) -> str:
-        if not self.model or audio_16k_f32.size == 0:
-            return ""
-        try:
-            segments, _ = self.model.transcribe(audio_16k_f32, language="en")
-            texts: List[str] = []
-            for seg in segments:
-                t = getattr(seg, "text", "")
-                if t:
-                    texts.append(t.strip())
-            return " ".join(texts).strip()
-        except Exception:
-            return ""
-
-
 class TranscriberThread(QThread):
     transcriptReady = Signal(str)
 
@@ -135,10 +72,6 @@ class TranscriberThread(QThread):
             import soundcard as sc
         except Exception:
             sc = None  # type: ignore
-        try:
-            import webrtcvad  # type: ignore
-        except Exception:
-            webrtcvad = None  # type: ignore
 
         # If no audio lib, keep legacy simulation so app still works
         if sc is None:
@@ -180,23 +113,14 @@ class TranscriberThread(QThread):
             return
 
         # Initialize optional VAD and STT
-        vad = None
-        if webrtcvad is not None:
-            try:
-                vad = webrtcvad.Vad(self.vad_level)
-            except Exception:
-                vad = None
-        stt = _WhisperSTT()
+        vad = make_vad(self.vad_level)
+        stt = WhisperSTT()
 
         # Capture and segment to speech chunks at 16 kHz
         frame_ms = 30  # 30ms frames for VAD
-        sr_target = 16000
-        seg_active = False
-        speech_frames_16k: List[np.ndarray] = []
-        non_speech_count = 0
-        start_speech_margin = 3  # ~90ms
-        end_speech_margin = 8    # ~240ms
-        consecutive_speech = 0
+        processor = BlockProcessor()
+        # start after ~90ms of speech, end after ~240ms of silence
+        segmenter = SpeechSegmenter(vad=vad, start_margin=3, end_margin=8)
 
         try:
             # Try multiple samplerates for compatibility
@@ -228,59 +152,17 @@ class TranscriberThread(QThread):
                             block = rec.record(samples_per_chunk)  # typically shape (N, C)
                             if block.size == 0:
                                 continue
-                            # Mix to mono robustly (handle 1D or 2D input), then downsample/resample to 16k
-                            if getattr(block, "ndim", 1) == 1:
-                                mono_48k = block.astype(np.float32, copy=False)
-                            else:
-                                mono_48k = block.mean(axis=1).astype(np.float32, copy=False)
-                            if sr_in == 48000:
-                                mono_16k = _downsample_mono_48k_to_16k(mono_48k)
-                            else:
-                                mono_16k = _resample_linear(mono_48k, sr_in=sr_in, sr_out=sr_target)
-                            if mono_16k.size == 0:
+                            # Mix to mono and bring to 16k (reused buffers), then VAD-segment
+                            mono_16k = processor.process(block, sr_in)
+                            audio = segmenter.feed(mono_16k)
+                            if audio is None:
                                 continue
-                            
-                            # VAD decision
-                            is_speech = False
-                            if vad is not None:
-                                pcm = _float32_to_pcm16(mono_16k)
-                                # 30ms at 16k is 480 samples
-                                # mono_16k may be 480 samples due to decimation of a 30ms 48k block -> 10ms; to keep logic simple, we group to ~30ms by buffering 3 frames
-                                # Here, operate per-block as approximation
-                                try:
-                                    is_speech = vad.is_speech(pcm, 16000)
-                                except Exception:
-                                    is_speech = False
-                            else:
-                                # Simple energy-based fallback
-                                rms = float(np.sqrt(np.mean(mono_16k**2)))
-                                is_speech = rms > 0.01
-                            
-                            if is_speech:
-                                consecutive_speech += 1
-                                non_speech_count = 0
-                                if not seg_active and consecutive_speech >= start_speech_margin:
-                                    seg_active = True
-                                    speech_frames_16k = []
-                                if seg_active:
-                                    speech_frames_16k.append(mono_16k)
-                            else:
-                                consecutive_speech = 0
-                                if seg_active:
-                                    non_speech_count += 1
-                                    if non_speech_count >= end_speech_margin:
-                                        # finalize segment
-                                        seg_active = False
-                                        non_speech_count = 0
-                                        audio = np.concatenate(speech_frames_16k) if speech_frames_16k else np.empty((0,), dtype=np.float32)
-                                        text = ""
-                                        if stt.available():
-                                            text = stt.transcribe(audio)
-                                        if not text:
-                                            dur = audio.shape[0] / 16000.0 if audio.size else 0.0
-                                            text = f"[Audio segment ~{dur:.1f}s]"
-                                        self.transcriptReady.emit(text)
-                                        speech_frames_16k = []
+                            text = ""
+                            if stt.available():
+                                text = stt.transcribe(audio)
+                            if not text:
+                                text = placeholder_text(audio)
+                            self.transcriptReady.emit(text)
                         opened = True
                     break
                 except Exception as e_open:
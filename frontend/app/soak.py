@@ -0,0 +1,302 @@
+"""Long-session soak test for the audio pipeline.
+
+Drives the same capture-independent stages the app uses (mono mix/resample, VAD
+segmentation, STT, transcript sink) from synthetic or replayed audio, faster than real
+time, and watches memory. Takes periodic tracemalloc snapshots, tracks RSS, allocation
+rate and GC pauses per stage, and exits non-zero if memory grows past the budget after
+warm-up.
+
+    # 4 hours of synthetic 48 kHz stereo as fast as possible, 16 MB RSS budget
+    python -m frontend.app.soak --hours 4 --budget-mb 16
+
+    # Replay a recorded meeting at 60x, with on-device STT
+    python -m frontend.app.soak --source meeting.wav --hours 2 --speed 60 --stt
+"""
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+import tracemalloc
+import wave
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .core.audio import BlockProcessor, SpeechSegmenter, make_vad
+from .core.memstats import StageProfiler, format_mb, rss_bytes
+from .core.stt import WhisperSTT, placeholder_text
+
+BLOCK_MS = 30  # matches TranscriberThread's capture block
+
+
+class SyntheticSource:
+    """Speech-like bursts (voiced harmonics + noise) separated by near-silence."""
+
+    def __init__(self, sr: int, channels: int, seed: int = 0):
+        self.sr = sr
+        self.channels = channels
+        self.n = int(sr * BLOCK_MS / 1000)
+        self.rng = np.random.default_rng(seed)
+        self.t = 0
+        self._left = 0
+        self._speech = False
+
+    def read(self) -> np.ndarray:
+        if self._left <= 0:
+            self._speech = not self._speech
+            seconds = self.rng.uniform(1.0, 6.0) if self._speech else self.rng.uniform(0.4, 2.0)
+            self._left = int(seconds * 1000 / BLOCK_MS)
+        self._left -= 1
+        # A fresh array per block, like soundcard's recorder.record()
+        t = (self.t + np.arange(self.n)) / self.sr
+        self.t += self.n
+        if self._speech:
+            f0 = 120.0 + 30.0 * math.sin(self.t / self.sr)
+            mono = 0.08 * (np.sin(2 * np.pi * f0 * t) + 0.5 * np.sin(4 * np.pi * f0 * t))
+            mono += 0.02 * self.rng.standard_normal(self.n)
+        else:
+            mono = 0.001 * self.rng.standard_normal(self.n)
+        return np.repeat(mono.astype(np.float32)[:, None], self.channels, axis=1)
+
+
+class WavSource:
+    """Loop a 16-bit PCM WAV file in capture-sized blocks."""
+
+    def __init__(self, path: str):
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise SystemExit(f"{path}: only 16-bit PCM WAV is supported")
+            self.sr = wf.getframerate()
+            self.channels = wf.getnchannels()
+            raw = wf.readframes(wf.getnframes())
+        pcm = np.frombuffer(raw, dtype=np.int16).reshape(-1, self.channels)
+        self.audio = (pcm.astype(np.float32) / 32768.0)
+        self.n = int(self.sr * BLOCK_MS / 1000)
+        if self.audio.shape[0] < self.n:
+            raise SystemExit(f"{path}: file is shorter than one {BLOCK_MS} ms block")
+        self.pos = 0
+
+    def read(self) -> np.ndarray:
+        if self.pos + self.n > self.audio.shape[0]:
+            self.pos = 0
+        block = self.audio[self.pos:self.pos + self.n].copy()
+        self.pos += self.n
+        return block
+
+
+class TranscriptSink:
+    """Stand-in for the capped transcript view (QTextDocument maximumBlockCount)."""
+
+    def __init__(self, max_lines: int):
+        self.lines: deque = deque(maxlen=max_lines if max_lines > 0 else None)
+        self.total = 0
+
+    def append(self, text: str) -> None:
+        self.lines.append(text)
+        self.total += 1
+
+
+class _PlaceholderSTT:
+    def available(self) -> bool:
+        return False
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        return ""
+
+
+def _top_growth(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> List[str]:
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    return [str(s) for s in stats[:limit] if s.size_diff > 0]
+
+
+def run(args: argparse.Namespace) -> int:
+    if args.source == "synthetic":
+        source = SyntheticSource(args.sr, args.channels, seed=args.seed)
+    else:
+        source = WavSource(args.source)
+    sr = source.sr
+    block_s = source.n / sr
+
+    stt = _PlaceholderSTT()
+    if args.stt:
+        stt = WhisperSTT()
+        if not stt.available():
+            print("[soak] faster-whisper unavailable; using placeholder segments", file=sys.stderr)
+
+    processor = BlockProcessor()
+    segmenter = SpeechSegmenter(vad=make_vad(args.vad_level), start_margin=3, end_margin=8)
+    sink = TranscriptSink(args.transcript_lines)
+    profiler = StageProfiler()
+    profiler.install()
+
+    if args.tracemalloc:
+        tracemalloc.start(args.trace_frames)
+
+    total_blocks = int(args.hours * 3600 / block_s)
+    snapshot_blocks = max(1, int(args.snapshot_every / block_s))
+    warmup_blocks = min(total_blocks, int(args.warmup / block_s))
+    started = time.perf_counter()
+    baseline: Optional[Dict] = None
+    baseline_snap = None
+    history: List[Dict] = []
+    last_alloc: Dict[str, int] = {}
+    last_wall = started
+    segments = 0
+    processed = 0  # blocks fully handled; less than total_blocks after Ctrl+C
+
+    def sample(block_idx: int) -> Dict:
+        nonlocal last_wall
+        now = time.perf_counter()
+        interval = max(1e-9, now - last_wall)
+        last_wall = now
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        stages = {}
+        for name, st in profiler.stages.items():
+            stages[name] = {
+                "alloc_mb_per_s": (st.alloc_bytes - last_alloc.get(name, 0)) / interval / 1048576,
+                "avg_us": st.seconds / st.calls * 1e6 if st.calls else 0.0,
+                "gc_pauses": st.gc_pauses,
+                "gc_ms": st.gc_seconds * 1000,
+            }
+            last_alloc[name] = st.alloc_bytes
+        return {
+            "audio_s": round(block_idx * block_s, 1),
+            "wall_s": round(now - started, 1),
+            "rss": rss_bytes(),
+            "traced": traced,
+            "gc_counts": gc.get_count(),
+            "gc_pauses": profiler.gc_pauses,
+            "gc_max_ms": profiler.gc_max_seconds * 1000,
+            "segments": segments,
+            "stages": stages,
+        }
+
+    def report(point: Dict) -> None:
+        rates = " ".join(f"{k}={v['alloc_mb_per_s']:.1f}MB/s" for k, v in point["stages"].items())
+        print(
+            f"[soak] audio {point['audio_s'] / 3600:6.2f}h wall {point['wall_s']:7.1f}s "
+            f"rss {format_mb(point['rss']):>9} traced {format_mb(point['traced']):>9} "
+            f"gc {point['gc_pauses']} (max {point['gc_max_ms']:.1f} ms) segs {point['segments']} | {rates}",
+            flush=True,
+        )
+
+    try:
+        for i in range(1, total_blocks + 1):
+            with profiler.stage("capture"):
+                block = source.read()
+            with profiler.stage("resample"):
+                mono = processor.process(block, sr)
+            with profiler.stage("vad"):
+                audio = segmenter.feed(mono)
+            if audio is not None:
+                with profiler.stage("stt"):
+                    text = stt.transcribe(audio) if stt.available() else ""
+                    if not text:
+                        text = placeholder_text(audio)
+                with profiler.stage("sink"):
+                    sink.append(text)
+                segments += 1
+            processed = i
+
+            if args.speed > 0:
+                ahead = i * block_s / args.speed - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+            if i == warmup_blocks:
+                gc.collect()
+                baseline = sample(i)
+                if tracemalloc.is_tracing():
+                    baseline_snap = tracemalloc.take_snapshot()
+                print(f"[soak] warm-up done, baseline rss {format_mb(baseline['rss'])}", flush=True)
+            if i % snapshot_blocks == 0:
+                point = sample(i)
+                history.append(point)
+                report(point)
+    except KeyboardInterrupt:
+        print("[soak] interrupted", file=sys.stderr)
+    finally:
+        profiler.uninstall()
+
+    gc.collect()
+    final = sample(processed)
+    failures: List[str] = []
+    growth_rss = growth_traced = None
+    if baseline is not None:
+        if final["rss"] is not None and baseline["rss"] is not None:
+            growth_rss = final["rss"] - baseline["rss"]
+            if growth_rss > args.budget_mb * 1048576:
+                failures.append(f"RSS grew {format_mb(growth_rss)} after warm-up (budget {args.budget_mb} MB)")
+        if final["traced"] is not None and baseline["traced"] is not None:
+            growth_traced = final["traced"] - baseline["traced"]
+            if growth_traced > args.traced_budget_mb * 1048576:
+                failures.append(
+                    f"Python heap grew {format_mb(growth_traced)} after warm-up (budget {args.traced_budget_mb} MB)"
+                )
+
+    top: List[str] = []
+    if baseline_snap is not None:
+        top = _top_growth(baseline_snap, tracemalloc.take_snapshot(), args.top)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    print("\n[soak] per-stage summary")
+    print(f"{'stage':<10}{'calls':>10}{'avg us':>10}{'alloc MB':>11}{'gc pauses':>11}{'gc ms':>9}")
+    for name, st in profiler.stages.items():
+        avg = st.seconds / st.calls * 1e6 if st.calls else 0.0
+        print(f"{name:<10}{st.calls:>10}{avg:>10.1f}{st.alloc_bytes / 1048576:>11.1f}"
+              f"{st.gc_pauses:>11}{st.gc_seconds * 1000:>9.1f}")
+    print(f"\n[soak] {final['audio_s'] / 3600:.2f}h of audio in {final['wall_s']:.0f}s, "
+          f"{segments} segments, RSS growth {format_mb(growth_rss)}, heap growth {format_mb(growth_traced)}")
+    if top and (failures or args.verbose):
+        print("[soak] top allocation growth since warm-up:")
+        for line in top:
+            print("   ", line)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump({"baseline": baseline, "final": final, "history": history,
+                       "failures": failures, "top_growth": top}, fh, indent=2)
+
+    for f in failures:
+        print(f"[soak] FAIL: {f}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Audio pipeline soak test")
+    p.add_argument("--source", default="synthetic", help="'synthetic' or a 16-bit PCM WAV file to loop")
+    p.add_argument("--hours", type=float, default=1.0, help="hours of audio to process")
+    p.add_argument("--speed", type=float, default=0.0, help="playback speed multiplier (0 = unthrottled)")
+    p.add_argument("--sr", type=int, default=48000, help="synthetic capture sample rate")
+    p.add_argument("--channels", type=int, default=2, help="synthetic capture channels")
+    p.add_argument("--vad-level", type=int, default=2)
+    p.add_argument("--stt", action="store_true", help="run faster-whisper on segments (slow)")
+    p.add_argument("--transcript-lines", type=int, default=500, help="sink cap, mirrors TRANSCRIPT_MAX_LINES")
+    p.add_argument("--warmup", type=float, default=300.0, help="audio seconds before the memory baseline")
+    p.add_argument("--snapshot-every", type=float, default=600.0, help="audio seconds between snapshots")
+    p.add_argument("--budget-mb", type=float, default=16.0, help="allowed RSS growth after warm-up")
+    p.add_argument("--traced-budget-mb", type=float, default=4.0, help="allowed Python heap growth after warm-up")
+    p.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false",
+                   help="skip tracemalloc (faster; no per-stage allocation rates)")
+    p.add_argument("--trace-frames", type=int, default=1)
+    p.add_argument("--top", type=int, default=10, help="allocation sites to list on failure")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", dest="json_out", default=None)
+    p.add_argument("--verbose", action="store_true")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    sys.exit(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
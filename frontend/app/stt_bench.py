@@ -0,0 +1,175 @@
+"""Multi-stream throughput benchmark for the transcription server.
+
+Starts `frontend.app.stt_server` for each worker count, opens N concurrent synthetic
+speech streams against it and reports segment throughput, audio processed per wall
+second and segment latency (segment end -> transcript pushed).
+
+    # Real Whisper (needs faster-whisper): 8 streams, 1/2/4 workers, 2 min audio each at 4x
+    python -m frontend.app.stt_bench --streams 8 --workers 1,2,4 --seconds 120 --speed 4
+
+    # No model installed: simulate a decoder costing 0.3 s CPU per audio second
+    python -m frontend.app.stt_bench --streams 8 --workers 1,2,4 --fake-stt-rtf 0.3
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from .soak import SyntheticSource
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    v = sorted(values)
+    return v[max(0, min(len(v) - 1, math.ceil(pct / 100.0 * len(v)) - 1))]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _stream(url: str, idx: int, args: argparse.Namespace, results: Dict) -> None:
+    import websockets  # type: ignore
+
+    src = SyntheticSource(args.sr, args.channels, seed=idx)
+    blocks = int(args.seconds / (src.n / src.sr))
+    block_s = src.n / src.sr
+    per_message = max(1, args.blocks_per_message)
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps({"type": "start", "stream_id": f"bench-{idx}", "sample_rate": src.sr,
+                                  "channels": src.channels, "format": "s16le"}))
+        hello = json.loads(await ws.recv())
+        if hello.get("type") != "ready":
+            raise RuntimeError(f"stream {idx}: {hello}")
+
+        async def receive() -> None:
+            async for message in ws:
+                msg = json.loads(message)
+                if msg.get("type") == "transcript":
+                    results["latency_ms"].append(msg["latency_ms"])
+                    results["stt_ms"].append(msg["stt_ms"])
+                    results["audio_s"] += msg["audio_s"]
+                    results["segments"] += 1
+                elif msg.get("type") in ("done", "error"):
+                    return
+
+        receiver = asyncio.create_task(receive())
+        started = time.perf_counter()
+        sent = 0
+        while sent < blocks:
+            chunk = [src.read() for _ in range(min(per_message, blocks - sent))]
+            pcm = (np.clip(np.concatenate(chunk), -1.0, 1.0) * 32767.0).astype("<i2")
+            await ws.send(pcm.tobytes())
+            sent += len(chunk)
+            if args.speed > 0:
+                ahead = sent * block_s / args.speed - (time.perf_counter() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+        await ws.send(json.dumps({"type": "stop"}))
+        await receiver
+
+
+async def _run_clients(url: str, args: argparse.Namespace) -> Dict:
+    results = {"latency_ms": [], "stt_ms": [], "audio_s": 0.0, "segments": 0}
+    t0 = time.perf_counter()
+    await asyncio.gather(*[_stream(url, i, args, results) for i in range(args.streams)])
+    results["wall_s"] = time.perf_counter() - t0
+    return results
+
+
+async def _wait_port(port: int, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("stt_server exited during start-up")
+        try:
+            _, w = await asyncio.open_connection("127.0.0.1", port)
+            w.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("stt_server did not start in time")
+
+
+def _stop_server(proc: subprocess.Popen, timeout: float = 10.0) -> None:
+    """SIGINT lets the server shut its pool down; whatever is left of the group is killed."""
+    if proc.poll() is None:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            pass
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    proc.wait()
+
+
+def bench_workers(workers: int, args: argparse.Namespace) -> Dict:
+    port = _free_port()
+    cmd = [sys.executable, "-m", "frontend.app.stt_server", "--port", str(port), "--workers", str(workers),
+           "--fake-stt-rtf", str(args.fake_stt_rtf)]
+    if args.model:
+        cmd += ["--model", args.model]
+    # Own process group, so the server and its worker pool can be reaped together
+    proc = subprocess.Popen(cmd, start_new_session=True)
+    try:
+        asyncio.run(_wait_port(port, proc, args.startup_timeout))
+        r = asyncio.run(_run_clients(f"ws://127.0.0.1:{port}", args))
+    finally:
+        _stop_server(proc)
+    return {
+        "workers": workers,
+        "streams": args.streams,
+        "segments": r["segments"],
+        "wall_s": r["wall_s"],
+        "segments_per_s": r["segments"] / r["wall_s"] if r["wall_s"] else 0.0,
+        "audio_per_wall_s": r["audio_s"] / r["wall_s"] if r["wall_s"] else 0.0,
+        "latency_p50_ms": _percentile(r["latency_ms"], 50),
+        "latency_p95_ms": _percentile(r["latency_ms"], 95),
+        "stt_p50_ms": _percentile(r["stt_ms"], 50),
+    }
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="STT server multi-stream benchmark")
+    p.add_argument("--streams", type=int, default=8, help="concurrent client streams")
+    p.add_argument("--workers", default="1,2,4", help="comma-separated worker counts to compare")
+    p.add_argument("--seconds", type=float, default=60.0, help="audio seconds per stream")
+    p.add_argument("--speed", type=float, default=0.0, help="send rate vs real time (0 = as fast as accepted)")
+    p.add_argument("--sr", type=int, default=48000)
+    p.add_argument("--channels", type=int, default=2)
+    p.add_argument("--blocks-per-message", type=int, default=10, help="30 ms blocks per WebSocket frame")
+    p.add_argument("--model", default=None)
+    p.add_argument("--fake-stt-rtf", type=float, default=0.0, help="pass through to the server (no model needed)")
+    p.add_argument("--startup-timeout", type=float, default=120.0)
+    p.add_argument("--json", dest="json_out", default=None)
+    args = p.parse_args(argv)
+
+    rows = [bench_workers(int(w), args) for w in args.workers.split(",") if w.strip()]
+    print(f"{args.streams} streams x {args.seconds:.0f}s audio")
+    print(f"{'workers':>8}{'segments':>10}{'wall s':>9}{'seg/s':>8}{'audio s/s':>11}{'lat p50':>10}{'lat p95':>10}{'stt p50':>10}")
+    for r in rows:
+        print(f"{r['workers']:>8}{r['segments']:>10}{r['wall_s']:>9.1f}{r['segments_per_s']:>8.1f}"
+              f"{r['audio_per_wall_s']:>11.1f}{r['latency_p50_ms']:>10.0f}{r['latency_p95_ms']:>10.0f}{r['stt_p50_ms']:>10.0f}")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Headless multi-stream transcription server.
+
+Accepts many concurrent PCM streams over WebSocket, segments each with the same core
+pipeline as the desktop app (mix/resample to 16 kHz, VAD), and fans segments out to a
+process pool of warm faster-whisper workers so transcription isn't serialized on the
+GIL. Transcripts are pushed back on the stream's socket in order.
+
+    python -m frontend.app.stt_server --port 8765 --workers 4
+
+Protocol (one stream per connection):
+  client -> {"type": "start", "stream_id": "room-1", "sample_rate": 48000,
+             "channels": 2, "format": "s16le"}          (text; format s16le | f32le)
+  client -> binary PCM frames, interleaved, any size
+  client -> {"type": "stop"}                             (flushes the last segment)
+  server -> {"type": "ready", "stream_id": ..., "stt": "faster-whisper" | "placeholder"}
+  server -> {"type": "transcript", "stream_id", "seq", "text", "audio_s",
+             "queue_ms", "stt_ms", "latency_ms"}
+  server -> {"type": "done", "stream_id", "segments"}   (after stop)
+  server -> {"type": "error", "message"}
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .core.audio import BlockProcessor, SpeechSegmenter, make_vad
+from .core.stt import WhisperSTT, placeholder_text
+
+BLOCK_MS = 30
+
+# --- worker process side ----------------------------------------------------------
+
+_worker_stt: Optional[WhisperSTT] = None
+_worker_fake_rtf = 0.0
+
+
+def _init_worker(model_name: Optional[str], fake_rtf: float) -> None:
+    """Load the Whisper model once per worker process (kept warm for its lifetime)."""
+    global _worker_stt, _worker_fake_rtf
+    # Ctrl+C reaches the whole process group; the parent decides when the pool stops
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_fake_rtf = fake_rtf
+    _worker_stt = None if fake_rtf > 0 else WhisperSTT(model_name)
+
+
+def _worker_ready() -> bool:
+    return _worker_stt is not None and _worker_stt.available()
+
+
+def _transcribe(audio: np.ndarray) -> Tuple[str, float]:
+    t0 = time.perf_counter()
+    text = ""
+    if _worker_fake_rtf > 0:
+        # CPU-bound stand-in for benchmarking without a model: hold the core for
+        # audio_duration * rtf, like a real decoder would
+        deadline = t0 + audio.shape[0] / 16000.0 * _worker_fake_rtf
+        x = 0
+        while time.perf_counter() < deadline:
+            x += 1
+    elif _worker_stt is not None and _worker_stt.available():
+        text = _worker_stt.transcribe(audio)
+    return text or placeholder_text(audio), time.perf_counter() - t0
+
+
+# --- server side ------------------------------------------------------------------
+
+class StreamSession:
+    """Per-connection decode + segmentation state."""
+
+    def __init__(self, stream_id: str, sample_rate: int, channels: int, fmt: str, vad_level: int):
+        if fmt not in ("s16le", "f32le"):
+            raise ValueError(f"unsupported format {fmt!r}")
+        if not (8000 <= sample_rate <= 192000) or not (1 <= channels <= 8):
+            raise ValueError("unsupported sample_rate/channels")
+        self.stream_id = stream_id
+        self.sr = sample_rate
+        self.channels = channels
+        self.dtype = np.int16 if fmt == "s16le" else np.float32
+        self.frame_bytes = np.dtype(self.dtype).itemsize * channels
+        self.block_bytes = int(sample_rate * BLOCK_MS / 1000) * self.frame_bytes
+        self.pending = bytearray()
+        self.processor = BlockProcessor()
+        self.segmenter = SpeechSegmenter(vad=make_vad(vad_level), start_margin=3, end_margin=8)
+        self.scale = 1.0 / 32768.0 if self.dtype == np.int16 else 1.0
+        self._block_f32 = np.empty((self.block_bytes // self.frame_bytes, channels), dtype=np.float32)
+
+    def feed(self, data: bytes):
+        """Yield finished 16 kHz segments from a chunk of interleaved PCM."""
+        self.pending += data
+        n_blocks = len(self.pending) // self.block_bytes
+        if not n_blocks:
+            return
+        # Detach whole blocks first so the bytearray can be resized while we iterate
+        ready = bytes(self.pending[: n_blocks * self.block_bytes])
+        del self.pending[: n_blocks * self.block_bytes]
+        frames = np.frombuffer(ready, dtype=self.dtype).reshape(n_blocks, -1, self.channels)
+        for raw in frames:
+            np.multiply(raw, self.scale, out=self._block_f32, casting="unsafe")
+            audio = self.segmenter.feed(self.processor.process(self._block_f32, self.sr))
+            if audio is not None:
+                yield audio
+
+    def flush(self) -> Optional[np.ndarray]:
+        return self.segmenter.flush()
+
+
+class TranscriptionServer:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.pool = ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(args.model, args.fake_stt_rtf),
+        )
+        self.stt_mode = "placeholder"
+        self.active_streams = 0
+        self.segments = 0
+
+    async def warm_up(self) -> None:
+        """Start every worker and load its model before accepting streams."""
+        loop = asyncio.get_running_loop()
+        ready = await asyncio.gather(*[loop.run_in_executor(self.pool, _worker_ready)
+                                       for _ in range(self.args.workers)])
+        if self.args.fake_stt_rtf > 0:
+            self.stt_mode = f"fake(rtf={self.args.fake_stt_rtf})"
+        elif any(ready):
+            self.stt_mode = "faster-whisper"
+        print(f"[stt-server] {self.args.workers} worker(s) warm, STT: {self.stt_mode}", file=sys.stderr)
+
+    async def handle(self, ws, path=None) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            hello = json.loads(await asyncio.wait_for(ws.recv(), timeout=10))
+            if not isinstance(hello, dict) or hello.get("type") != "start":
+                raise ValueError("first message must be {\"type\": \"start\", ...}")
+            session = StreamSession(
+                str(hello.get("stream_id") or f"stream-{id(ws):x}"),
+                int(hello.get("sample_rate", 16000)),
+                int(hello.get("channels", 1)),
+                str(hello.get("format", "s16le")),
+                self.args.vad_level,
+            )
+        except Exception as e:
+            await ws.send(json.dumps({"type": "error", "message": f"bad start message: {e}"}))
+            return
+
+        # Futures are awaited in submission order so each stream's transcripts stay ordered
+        outbox: asyncio.Queue = asyncio.Queue()
+        seq = 0
+
+        async def sender() -> None:
+            while True:
+                item = await outbox.get()
+                if item is None:
+                    return
+                n, fut, audio_s, finalized_at, submitted_at = item
+                text, stt_s = await fut
+                now = time.perf_counter()
+                await ws.send(json.dumps({
+                    "type": "transcript",
+                    "stream_id": session.stream_id,
+                    "seq": n,
+                    "text": text,
+                    "audio_s": round(audio_s, 2),
+                    "queue_ms": round((now - submitted_at - stt_s) * 1000, 1),
+                    "stt_ms": round(stt_s * 1000, 1),
+                    "latency_ms": round((now - finalized_at) * 1000, 1),
+                }))
+
+        def submit(audio: np.ndarray) -> None:
+            nonlocal seq
+            seq += 1
+            self.segments += 1
+            now = time.perf_counter()
+            fut = loop.run_in_executor(self.pool, _transcribe, audio)
+            outbox.put_nowait((seq, fut, audio.shape[0] / 16000.0, now, now))
+
+        self.active_streams += 1
+        send_task = asyncio.create_task(sender())
+        await ws.send(json.dumps({"type": "ready", "stream_id": session.stream_id, "stt": self.stt_mode}))
+        try:
+            async for message in ws:
+                if isinstance(message, (bytes, bytearray)):
+                    for audio in session.feed(message):
+                        submit(audio)
+                    # Backpressure: stop reading while too many segments are outstanding
+                    while outbox.qsize() > self.args.max_pending:
+                        await asyncio.sleep(0.01)
+                    continue
+                try:
+                    ctrl = json.loads(message)
+                except ValueError:
+                    continue
+                if isinstance(ctrl, dict) and ctrl.get("type") == "stop":
+                    break
+            tail = session.flush()
+            if tail is not None:
+                submit(tail)
+            outbox.put_nowait(None)
+            await send_task
+            await ws.send(json.dumps({"type": "done", "stream_id": session.stream_id, "segments": seq}))
+        except Exception as e:
+            # Connection dropped (or a bug): stop delivering, let in-flight work finish in the pool
+            send_task.cancel()
+            print(f"[stt-server] stream {session.stream_id} ended: {e.__class__.__name__}: {e}", file=sys.stderr)
+        finally:
+            self.active_streams -= 1
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def serve(args: argparse.Namespace, started: Optional[asyncio.Event] = None) -> None:
+    try:
+        import websockets  # type: ignore
+    except Exception:
+        raise SystemExit("The STT server needs the 'websockets' package: pip install websockets")
+
+    server = TranscriptionServer(args)
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+
+    def stop(signame: str) -> None:
+        # A plain SIGTERM would kill this process before the finally below and orphan the pool
+        print(f"[stt-server] {signame}, shutting down", file=sys.stderr, flush=True)
+        server.close()
+        if task is not None:
+            task.cancel()
+
+    handled = []
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop, sig.name)
+            handled.append(sig)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # Windows, or not the main thread: fall back to KeyboardInterrupt
+    try:
+        await server.warm_up()
+        async with websockets.serve(server.handle, args.host, args.port, max_size=None):
+            print(f"[stt-server] listening on ws://{args.host}:{args.port}", file=sys.stderr, flush=True)
+            if started is not None:
+                started.set()
+            await asyncio.Future()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        for sig in handled:
+            loop.remove_signal_handler(sig)
+        server.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Headless multi-stream transcription server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                   help="Whisper worker processes (default: CPU count - 1)")
+    p.add_argument("--model", default=None, help="faster-whisper model (default WHISPER_MODEL or tiny.en)")
+    p.add_argument("--vad-level", type=int, default=2)
+    p.add_argument("--max-pending", type=int, default=8, help="outstanding segments per stream before reads pause")
+    p.add_argument("--fake-stt-rtf", type=float, default=0.0,
+                   help="benchmark only: replace Whisper with a CPU busy-loop of audio_s * RTF")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
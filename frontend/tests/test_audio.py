@@ -0,0 +1,177 @@
+"""Regression tests for frontend/app/core/audio.py.
+
+The reference functions below are the resampling and segmentation code that used to live
+inline in TranscriberThread; BlockProcessor and SpeechSegmenter must keep producing the
+same output. Run from the repository root: python -m pytest frontend/tests
+"""
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from frontend.app.core.audio import SR_TARGET, BlockProcessor, SpeechSegmenter
+
+
+def _downsample_mono_48k_to_16k(x: np.ndarray) -> np.ndarray:
+    if x.ndim > 1:
+        x = x.mean(axis=1)
+    n = (x.shape[0] // 3) * 3
+    if n <= 0:
+        return np.empty((0,), dtype=np.float32)
+    return x[:n].reshape(-1, 3).mean(axis=1).astype(np.float32, copy=False)
+
+
+def _resample_linear(x: np.ndarray, sr_in: int, sr_out: int) -> np.ndarray:
+    if sr_in == sr_out or x.size == 0:
+        return x.astype(np.float32, copy=False)
+    duration = x.shape[0] / float(sr_in)
+    n_out = max(1, int(round(duration * sr_out)))
+    xp = np.linspace(0.0, duration, num=x.shape[0], endpoint=False, dtype=np.float64)
+    x_new = np.linspace(0.0, duration, num=n_out, endpoint=False, dtype=np.float64)
+    return np.interp(x_new, xp, x.astype(np.float32, copy=False)).astype(np.float32, copy=False)
+
+
+def _reference_segments(blocks: List[np.ndarray], start_margin: int = 3, end_margin: int = 8) -> List[np.ndarray]:
+    """The old list-of-blocks segmenter with the energy fallback."""
+    out, frames = [], []
+    active, consecutive, non_speech = False, 0, 0
+    for b in blocks:
+        if float(np.sqrt(np.mean(b ** 2))) > 0.01:
+            consecutive += 1
+            non_speech = 0
+            if not active and consecutive >= start_margin:
+                active, frames = True, []
+            if active:
+                frames.append(b)
+        else:
+            consecutive = 0
+            if active:
+                non_speech += 1
+                if non_speech >= end_margin:
+                    active, non_speech = False, 0
+                    out.append(np.concatenate(frames))
+                    frames = []
+    return out
+
+
+def _speech(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (0.3 * np.sin(np.arange(n) * 0.05) + 0.05 * rng.standard_normal(n)).astype(np.float32)
+
+
+def _silence(n: int) -> np.ndarray:
+    return np.zeros((n,), dtype=np.float32)
+
+
+def _feed_all(seg: SpeechSegmenter, blocks: List[np.ndarray]) -> List[np.ndarray]:
+    out = []
+    for b in blocks:
+        audio: Optional[np.ndarray] = seg.feed(b)
+        if audio is not None:
+            out.append(audio)
+    return out
+
+
+@pytest.mark.parametrize("n", [1440, 1441, 1442, 4800, 3])
+def test_48k_matches_old_decimation(n):
+    x = _speech(n)
+    y = BlockProcessor().process(x, 48000)
+    ref = _downsample_mono_48k_to_16k(x)
+    assert y.shape == ref.shape == (n // 3,)
+    np.testing.assert_allclose(y, ref, rtol=1e-6, atol=1e-7)
+
+
+@pytest.mark.parametrize("sr,n", [(44100, 1323), (44100, 1024), (44100, 4410), (22050, 661), (32000, 960)])
+def test_generic_rate_matches_old_linear_resampler(sr, n):
+    x = _speech(n, seed=n)
+    y = BlockProcessor().process(x, sr)
+    ref = _resample_linear(x, sr, SR_TARGET)
+    assert y.shape == ref.shape
+    assert y.shape[0] == max(1, int(round(n / sr * SR_TARGET)))
+    np.testing.assert_allclose(y, ref, rtol=1e-6, atol=1e-7)
+
+
+@pytest.mark.parametrize("sr", [48000, 44100])
+def test_stereo_is_mixed_like_the_channel_mean(sr):
+    stereo = np.stack([_speech(1323 * 2, seed=1), _speech(1323 * 2, seed=2)], axis=1)
+    y = BlockProcessor().process(stereo, sr)
+    mono = stereo.mean(axis=1).astype(np.float32)
+    ref = _downsample_mono_48k_to_16k(mono) if sr == 48000 else _resample_linear(mono, sr, SR_TARGET)
+    np.testing.assert_allclose(y, ref, rtol=1e-5, atol=1e-6)
+
+
+def test_buffers_are_reused_across_block_sizes():
+    proc = BlockProcessor()
+    for n in (1323, 4410, 1323, 1024):
+        x = _speech(n, seed=n)
+        np.testing.assert_allclose(proc.process(x, 44100), _resample_linear(x, 44100, SR_TARGET), rtol=1e-6, atol=1e-7)
+    assert proc.process(_speech(480), SR_TARGET).shape == (480,)
+    assert proc.process(np.empty((0,), dtype=np.float32), 48000).shape == (0,)
+
+
+def test_segments_match_old_segmenter():
+    pattern = [(5, True), (20, False), (2, True), (3, False), (12, True), (7, False), (1, True), (9, False), (4, True), (10, False)]
+    blocks = []
+    for i, (count, speech) in enumerate(pattern):
+        for j in range(count):
+            blocks.append(_speech(480, seed=i * 100 + j) if speech else _silence(480))
+
+    got = _feed_all(SpeechSegmenter(), blocks)
+    ref = _reference_segments(blocks)
+    assert len(got) == len(ref) == 3
+    for a, b in zip(got, ref):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_start_and_end_margins():
+    seg = SpeechSegmenter(start_margin=3, end_margin=8)
+    speech = [_speech(480, seed=i) for i in range(6)]
+    # Two speech blocks are not enough to open a segment
+    assert _feed_all(seg, speech[:2] + [_silence(480)] * 10) == []
+    # The first start_margin - 1 blocks are dropped; the segment closes on the 8th silent block
+    assert _feed_all(seg, speech + [_silence(480)] * 7) == []
+    assert seg.active
+    out = seg.feed(_silence(480))
+    assert out is not None and not seg.active
+    np.testing.assert_array_equal(out, np.concatenate(speech[2:]))
+
+
+def test_long_speech_is_split_at_max_segment_length():
+    seg = SpeechSegmenter(max_segment_s=0.3)  # 4800 samples
+    blocks = [_speech(500, seed=i) for i in range(40)]
+    out = _feed_all(seg, blocks)
+    recorded = np.concatenate(blocks[2:])  # everything after the start margin
+    assert [a.shape[0] for a in out] == [4800, 4800, 4800]  # 38 x 500 recorded samples
+    assert seg.active
+    tail = seg.flush()
+    # No samples are lost at the split points
+    np.testing.assert_array_equal(np.concatenate(out + [tail]), recorded)
+
+
+def test_thirty_second_default_split():
+    seg = SpeechSegmenter()
+    block = _speech(480)
+    out = _feed_all(seg, [block] * 1003)
+    # 1001 recorded blocks: 1000 fill the 30 s buffer, one starts the next segment
+    assert len(out) == 1 and out[0].shape[0] == 30 * SR_TARGET
+    assert seg.flush().shape[0] == 480
+
+
+def test_flush():
+    seg = SpeechSegmenter()
+    assert seg.flush() is None
+    blocks = [_speech(480, seed=i) for i in range(5)]
+    _feed_all(seg, blocks)
+    tail = seg.flush()
+    np.testing.assert_array_equal(tail, np.concatenate(blocks[2:]))
+    assert seg.flush() is None
+    # After a flush a new segment needs the full start margin again
+    assert seg.feed(blocks[0]) is None and not seg.active
+
+
+def test_segments_are_owned_copies():
+    seg = SpeechSegmenter(end_margin=1)
+    first = _feed_all(seg, [_speech(480, seed=i) for i in range(4)] + [_silence(480)])[0]
+    snapshot = first.copy()
+    _feed_all(seg, [_speech(480, seed=10 + i) for i in range(4)] + [_silence(480)])
+    np.testing.assert_array_equal(first, snapshot)
@@ -0,0 +1,301 @@
+"""Load generator for the Laravel backend.
+
+Drives `/api/generate-answer`, `/api/transcripts` and `/api/personas` with a mix of
+simulated sessions and reports throughput and latency percentiles per endpoint.
+Run the backend against `tools/openai_stub.py` to get repeatable capacity numbers:
+
+    python tools/openai_stub.py --port 8787 &
+    python tools/loadgen.py --base-url http://127.0.0.1:8000 --users 20 --duration 60
+
+Session profiles (weights set with --mix):
+  interview  fetches personas once, then loops: a few transcript posts, one generate
+  listener   posts transcript segments only (someone leaving capture running)
+  browser    re-fetches personas (UI reloads)
+"""
+import argparse
+import http.client
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+QUESTIONS = [
+    "Tell me about yourself.",
+    "How do you handle tight deadlines?",
+    "Describe a challenging project and what you learned.",
+    "How would you design a rate limiter for a public API?",
+    "What is the difference between a process and a thread?",
+    "Tell me about a time you disagreed with a teammate.",
+    "How do you approach debugging a production incident?",
+    "Why do you want to work here?",
+]
+
+SEGMENTS = [
+    "Interviewer: Thanks for joining today.",
+    "Interviewer: Let's start with your background.",
+    "Interviewer: Can you walk me through your last project?",
+    "Interviewer: What was the hardest part?",
+    "Interviewer: How did you measure success?",
+]
+
+DEFAULT_MIX = "interview=0.7,listener=0.2,browser=0.1"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        out = {}
+        with self._lock:
+            for endpoint, values in sorted(self.latencies.items()):
+                v = sorted(values)
+                out[endpoint] = {
+                    "requests": len(v),
+                    "errors": self.errors.get(endpoint, 0),
+                    "rps": len(v) / elapsed if elapsed > 0 else 0.0,
+                    "p50_ms": percentile(v, 50) * 1000.0,
+                    "p95_ms": percentile(v, 95) * 1000.0,
+                    "p99_ms": percentile(v, 99) * 1000.0,
+                    "max_ms": (v[-1] if v else 0.0) * 1000.0,
+                }
+        return out
+
+
+class ApiClient:
+    """Keep-alive HTTP client, one per virtual user."""
+
+    def __init__(self, base_url: str, timeout: float, stats: Stats):
+        u = urlparse(base_url)
+        self.https = u.scheme == "https"
+        self.host = u.hostname or "127.0.0.1"
+        self.port = u.port or (443 if self.https else 80)
+        self.prefix = u.path.rstrip("/")
+        self.timeout = timeout
+        self.stats = stats
+        self.conn: Optional[http.client.HTTPConnection] = None
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, endpoint: str, body: Optional[dict] = None) -> Optional[dict]:
+        raw = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Accept": "application/json"}
+        if raw is not None:
+            headers["Content-Type"] = "application/json"
+        started = time.perf_counter()
+        ok = False
+        data = None
+        try:
+            if self.conn is None:
+                self.conn = self._connect()
+            self.conn.request(method, self.prefix + path, body=raw, headers=headers)
+            resp = self.conn.getresponse()
+            payload = resp.read()
+            ok = 200 <= resp.status < 300
+            if ok and payload:
+                if "ndjson" in (resp.getheader("Content-Type") or ""):
+                    # Draft/refine stream: the whole body is read, so latency covers the late refined answer too
+                    data = {"events": [json.loads(line) for line in payload.splitlines() if line.strip()]}
+                else:
+                    data = json.loads(payload)
+            if resp.getheader("Connection", "").lower() == "close":
+                self.close()
+        except Exception:
+            self.close()
+        self.stats.record(endpoint, time.perf_counter() - started, ok)
+        return data
+
+    def close(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, idx: int, profile: str, args: argparse.Namespace, stats: Stats, stop_at: float):
+        super().__init__(daemon=True)
+        self.profile = profile
+        self.args = args
+        self.stop_at = stop_at
+        self.rng = random.Random((args.seed or 0) * 1000 + idx)
+        self.session_id = f"load-{args.run_id}-{idx}"
+        self.client = ApiClient(args.base_url, args.timeout, stats)
+
+    def _think(self, base_ms: float) -> bool:
+        """Sleep a jittered think time; return False when the run is over."""
+        delay = self.rng.uniform(0.5, 1.5) * base_ms * self.args.think_scale / 1000.0
+        remaining = self.stop_at - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        return time.monotonic() < self.stop_at
+
+    def _personas(self) -> Optional[dict]:
+        return self.client.request("GET", "/api/personas", "GET /api/personas")
+
+    def _transcript(self) -> None:
+        self.client.request("POST", "/api/transcripts", "POST /api/transcripts", {
+            "session_id": self.session_id,
+            "text": self.rng.choice(SEGMENTS),
+            "source": "loadgen",
+        })
+
+    def _generate(self, persona_id: Optional[int]) -> None:
+        # Suffix keeps prompts unique so the backend's exact-match cache doesn't short-circuit
+        prompt = f"{self.rng.choice(QUESTIONS)} (#{uuid.uuid4().hex[:8]})"
+        if self.rng.random() < self.args.repeat_rate:
+            prompt = self.rng.choice(QUESTIONS)
+        self.client.request("POST", "/api/generate-answer", "POST /api/generate-answer", {
+            "session_id": self.session_id,
+            "persona_id": persona_id,
+            "prompt": prompt,
+            "model": self.args.model,
+            "mode": self.args.mode,
+        })
+
+    def run(self) -> None:
+        try:
+            if self.profile == "interview":
+                data = self._personas() or {}
+                ids = [p.get("id") for p in data.get("personas", []) if isinstance(p, dict)]
+                persona_id = self.rng.choice(ids) if ids else None
+                while time.monotonic() < self.stop_at:
+                    for _ in range(self.rng.randint(2, 6)):
+                        if not self._think(800):
+                            return
+                        self._transcript()
+                    if not self._think(1500):
+                        return
+                    self._generate(persona_id)
+            elif self.profile == "listener":
+                while self._think(700):
+                    self._transcript()
+            else:
+                while self._think(3000):
+                    self._personas()
+        finally:
+            self.client.close()
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("interview", "listener", "browser"):
+            raise SystemExit(f"Unknown profile in --mix: {name!r}")
+        mix[name] = float(weight or 1.0)
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("--mix must contain at least one positive weight")
+    return mix
+
+
+def assign_profiles(users: int, mix: Dict[str, float]) -> List[str]:
+    """Deterministic largest-remainder split of users across profiles."""
+    total = sum(mix.values())
+    exact = {k: users * w / total for k, w in mix.items()}
+    counts = {k: int(v) for k, v in exact.items()}
+    for k in sorted(exact, key=lambda k: exact[k] - counts[k], reverse=True)[: users - sum(counts.values())]:
+        counts[k] += 1
+    out: List[str] = []
+    for k, n in counts.items():
+        out += [k] * n
+    return out
+
+
+def run_load(args: argparse.Namespace) -> dict:
+    """Run one load test and return the summary dict (also used by tools/serve_bench.py)."""
+    if not getattr(args, "run_id", None):
+        args.run_id = uuid.uuid4().hex[:6]
+    stats = Stats()
+    mix = parse_mix(args.mix)
+    profiles = assign_profiles(args.users, mix)
+    started = time.monotonic()
+    stop_at = started + args.duration
+    users = []
+    for i, profile in enumerate(profiles):
+        u = VirtualUser(i, profile, args, stats, stop_at)
+        users.append(u)
+        u.start()
+        if args.ramp > 0 and len(profiles) > 1:
+            time.sleep(args.ramp / len(profiles))
+    for u in users:
+        u.join(timeout=max(0.0, stop_at - time.monotonic()) + args.timeout + 5)
+    elapsed = time.monotonic() - started
+    return {
+        "base_url": args.base_url,
+        "users": args.users,
+        "mix": mix,
+        "duration_s": round(elapsed, 2),
+        "endpoints": stats.summary(elapsed),
+    }
+
+
+def format_summary(summary: dict) -> str:
+    lines = [
+        f"{summary['users']} users, {summary['duration_s']}s against {summary['base_url']}",
+        f"{'endpoint':<28}{'reqs':>7}{'err':>6}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+    ]
+    for endpoint, s in summary["endpoints"].items():
+        lines.append(
+            f"{endpoint:<28}{s['requests']:>7}{s['errors']:>6}{s['rps']:>8.1f}"
+            f"{s['p50_ms']:>9.0f}{s['p95_ms']:>9.0f}{s['p99_ms']:>9.0f}{s['max_ms']:>9.0f}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Backend load generator")
+    p.add_argument("--base-url", default="http://127.0.0.1:8000")
+    p.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    p.add_argument("--duration", type=float, default=30.0, help="test length in seconds")
+    p.add_argument("--ramp", type=float, default=2.0, help="seconds over which users are started")
+    p.add_argument("--mix", default=DEFAULT_MIX, help=f"profile weights (default {DEFAULT_MIX})")
+    p.add_argument("--think-scale", type=float, default=1.0, help="multiply think times (0 = closed loop)")
+    p.add_argument("--repeat-rate", type=float, default=0.0, help="fraction of generates reusing a canned prompt")
+    p.add_argument("--model", default=None, help="model sent with generate requests")
+    p.add_argument("--mode", default=None, choices=["single", "draft_refine"], help="answer mode sent with generate requests")
+    p.add_argument("--timeout", type=float, default=60.0)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--json", dest="json_out", default=None, help="write the summary as JSON (baseline file)")
+    return p
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    summary = run_load(args)
+    print(format_summary(summary))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump(summary, fh, indent=2)
+        print(f"summary written to {args.json_out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
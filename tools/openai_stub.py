@@ -0,0 +1,219 @@
+"""Local stand-in for the OpenAI Chat Completions API.
+
+Used for load tests and benchmarks so the backend can be driven without network
+access or API spend. Point the backend at it with:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8787/v1
+    OPENAI_API_KEY=stub
+
+Supports non-streaming and streaming (`"stream": true`, SSE) responses with
+configurable time-to-first-byte, total latency, jitter and error rate.
+
+    python tools/openai_stub.py --port 8787 --ttfb-ms 300 --latency-ms 1200 --error-rate 0.02
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+FILLER = (
+    "In my last role I owned the service end to end, from design through on-call. "
+    "I focused on measurable outcomes, kept the scope tight, and communicated trade-offs early. "
+    "The result was a faster release cadence and fewer incidents."
+).split(" ")
+
+
+class StubConfig:
+    def __init__(self, args: argparse.Namespace):
+        self.ttfb_ms = max(0, args.ttfb_ms)
+        self.latency_ms = max(self.ttfb_ms, args.latency_ms)
+        self.jitter_ms = max(0, args.jitter_ms)
+        self.error_rate = min(1.0, max(0.0, args.error_rate))
+        self.tokens = max(1, args.tokens)
+        # Per-model overrides, e.g. --model-latency gpt-4o=2500:600 (total[:ttfb])
+        self.model_latency: Dict[str, tuple] = {}
+        for spec in args.model_latency or []:
+            name, _, value = spec.partition("=")
+            total, _, ttfb = value.partition(":")
+            try:
+                total_ms = int(total)
+                ttfb_ms = int(ttfb) if ttfb else min(self.ttfb_ms, total_ms)
+            except ValueError:
+                raise SystemExit(f"Invalid --model-latency value: {spec!r}")
+            self.model_latency[name.strip()] = (ttfb_ms, max(ttfb_ms, total_ms))
+        self.rng = random.Random(args.seed)
+        self._rng_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def sample(self, model: str) -> tuple:
+        """Return (ttfb_s, total_s, fail) for one request."""
+        ttfb_ms, total_ms = self.model_latency.get(model, (self.ttfb_ms, self.latency_ms))
+        with self._rng_lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            fail = self.rng.random() < self.error_rate
+            self.requests += 1
+            if fail:
+                self.errors += 1
+        ttfb = max(0.0, ttfb_ms + jitter) / 1000.0
+        total = max(ttfb, (total_ms + jitter) / 1000.0)
+        return ttfb, total, fail
+
+
+def _answer_tokens(n: int, seed: str) -> list:
+    rng = random.Random(seed)
+    start = rng.randrange(len(FILLER))
+    return [FILLER[(start + i) % len(FILLER)] for i in range(n)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "openai-stub/1.0"
+    protocol_version = "HTTP/1.1"
+    config: Optional[StubConfig] = None
+
+    def log_message(self, fmt, *args):  # keep load-test output readable
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(fmt, *args)
+
+    def _send_json(self, code: int, body: dict) -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/health", "/v1/health"):
+            cfg = self.config
+            self._send_json(200, {"status": "ok", "requests": cfg.requests, "errors": cfg.errors})
+            return
+        if self.path.rstrip("/") == "/v1/models":
+            models = sorted({"gpt-4o-mini", "gpt-4o", *self.config.model_latency.keys()})
+            self._send_json(200, {"object": "list", "data": [{"id": m, "object": "model"} for m in models]})
+            return
+        self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+        try:
+            payload = json.loads(raw or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON", "type": "invalid_request_error"}})
+            return
+
+        model = str(payload.get("model") or "gpt-4o-mini")
+        messages = payload.get("messages") or []
+        prompt = str(messages[-1].get("content", "")) if messages else ""
+        ttfb, total, fail = self.config.sample(model)
+
+        started = time.monotonic()
+        time.sleep(ttfb)
+        if fail:
+            self._send_json(500, {"error": {"message": "Stub injected failure", "type": "server_error"}})
+            return
+
+        tokens = _answer_tokens(self.config.tokens, prompt)
+        completion_id = "chatcmpl-" + uuid.uuid4().hex[:24]
+        created = int(time.time())
+        if payload.get("stream"):
+            try:
+                self._stream(completion_id, created, model, tokens, started, total)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # client went away mid-stream
+            return
+
+        remaining = total - (time.monotonic() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": " ".join(tokens)},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": max(1, len(prompt) // 4),
+                "completion_tokens": len(tokens),
+                "total_tokens": max(1, len(prompt) // 4) + len(tokens),
+            },
+        })
+
+    def _stream(self, completion_id: str, created: int, model: str, tokens: list, started: float, total: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(data: dict) -> None:
+            line = ("data: " + json.dumps(data) + "\n\n").encode("utf-8")
+            self.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+            self.wfile.flush()
+
+        base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+        chunk({**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]})
+        # Spread the remaining latency evenly over the tokens
+        per_token = max(0.0, total - (time.monotonic() - started)) / len(tokens)
+        for i, tok in enumerate(tokens):
+            if per_token:
+                time.sleep(per_token)
+            text = tok if i == 0 else " " + tok
+            chunk({**base, "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]})
+        chunk({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        done = b"data: [DONE]\n\n"
+        self.wfile.write(f"{len(done):X}\r\n".encode("ascii") + done + b"\r\n0\r\n\r\n")
+        self.wfile.flush()
+
+
+def build_server(args: argparse.Namespace) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": StubConfig(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    server.verbose = args.verbose  # type: ignore[attr-defined]
+    return server
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Local OpenAI Chat Completions stub")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8787)
+    p.add_argument("--ttfb-ms", type=int, default=300, help="time to first byte (ms)")
+    p.add_argument("--latency-ms", type=int, default=1200, help="total response time (ms)")
+    p.add_argument("--jitter-ms", type=int, default=100, help="uniform +/- jitter applied to both (ms)")
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    p.add_argument("--tokens", type=int, default=60, help="words per answer")
+    p.add_argument("--model-latency", action="append", metavar="MODEL=TOTAL[:TTFB]",
+                   help="per-model latency override in ms, repeatable")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--verbose", action="store_true")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    server = build_server(args)
+    print(f"[openai-stub] listening on http://{args.host}:{args.port}/v1", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Serving-mode benchmark: `php artisan serve` vs Octane persistent workers.
+
+Starts the local OpenAI stub in-process, then for each mode boots the backend pointed
+at it, waits for /api/health and drives it with the load generator (tools/loadgen.py).
+Prints RPS and latency percentiles per endpoint side by side; the interesting column is
+`POST /api/transcripts` p95, which under `artisan serve` queues behind generate calls.
+
+    # needs PHP + composer install in backend/, and laravel/octane for the octane mode
+    python tools/serve_bench.py --modes serve,octane --users 20 --duration 30 --llm-latency-ms 4000
+    python tools/serve_bench.py --modes serve,serve-multi,octane --octane-server roadrunner --json serve.json
+
+Modes:
+  serve        php artisan serve (PHP_CLI_SERVER_WORKERS=1, the documented default)
+  serve-multi  php artisan serve with PHP_CLI_SERVER_WORKERS=--workers (forked cli-server)
+  octane       php artisan octane:start --server=--octane-server --workers=--workers
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import loadgen
+import openai_stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_stub(args: argparse.Namespace):
+    stub_args = openai_stub.parse_args([
+        "--port", str(args.stub_port),
+        "--ttfb-ms", str(args.llm_ttfb_ms),
+        "--latency-ms", str(args.llm_latency_ms),
+        "--jitter-ms", "50",
+        "--seed", "1",
+    ])
+    server = openai_stub.build_server(stub_args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def backend_command(mode: str, args: argparse.Namespace):
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.stub_port}/v1",
+        "OPENAI_API_KEY": env.get("OPENAI_API_KEY") or "stub-key",
+        # Measure serving overhead, not the answer bank or exact-match cache
+        "ANSWER_BANK_ENABLED": "false",
+    })
+    if mode == "serve":
+        env["PHP_CLI_SERVER_WORKERS"] = "1"
+        cmd = [args.php, "artisan", "serve", "--host=127.0.0.1", f"--port={args.port}"]
+    elif mode == "serve-multi":
+        env["PHP_CLI_SERVER_WORKERS"] = str(args.workers)
+        cmd = [args.php, "artisan", "serve", "--host=127.0.0.1", f"--port={args.port}"]
+    elif mode == "octane":
+        cmd = [args.php, "artisan", "octane:start", f"--server={args.octane_server}", "--host=127.0.0.1",
+               f"--port={args.port}", f"--workers={args.workers}", f"--max-requests={args.max_requests}"]
+    else:
+        raise SystemExit(f"Unknown mode {mode!r} (expected serve, serve-multi or octane)")
+    return cmd, env
+
+
+def wait_healthy(base_url: str, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"backend exited with code {proc.returncode} during start-up")
+        try:
+            with urllib.request.urlopen(base_url + "/api/health", timeout=2) as r:
+                if r.status == 200:
+                    return
+        except Exception:
+            time.sleep(0.3)
+    raise RuntimeError("backend did not become healthy in time")
+
+
+def stop(proc: subprocess.Popen) -> None:
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGTERM)
+        else:
+            proc.terminate()
+        proc.wait(timeout=15)
+    except Exception:
+        proc.kill()
+
+
+def bench_mode(mode: str, args: argparse.Namespace) -> dict:
+    cmd, env = backend_command(mode, args)
+    base_url = f"http://127.0.0.1:{args.port}"
+    log = open(os.path.join(args.log_dir, f"serve_bench_{mode}.log"), "w", encoding="utf-8") if args.log_dir else subprocess.DEVNULL
+    proc = subprocess.Popen(cmd, cwd=args.backend_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                            start_new_session=(os.name == "posix"))
+    try:
+        wait_healthy(base_url, proc, args.startup_timeout)
+        load_args = loadgen.build_parser().parse_args([
+            "--base-url", base_url,
+            "--users", str(args.users),
+            "--duration", str(args.duration),
+            "--mix", args.mix,
+            "--seed", "1",
+        ])
+        summary = loadgen.run_load(load_args)
+    finally:
+        stop(proc)
+        if log is not subprocess.DEVNULL:
+            log.close()
+    summary["mode"] = mode
+    return summary
+
+
+def format_comparison(results: list) -> str:
+    endpoints = []
+    for r in results:
+        for e in r["endpoints"]:
+            if e not in endpoints:
+                endpoints.append(e)
+    lines = [f"{'endpoint':<28}{'mode':<13}{'reqs':>7}{'err':>6}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"]
+    for e in endpoints:
+        for r in results:
+            s = r["endpoints"].get(e)
+            if not s:
+                continue
+            lines.append(f"{e:<28}{r['mode']:<13}{s['requests']:>7}{s['errors']:>6}{s['rps']:>8.1f}"
+                         f"{s['p50_ms']:>9.0f}{s['p95_ms']:>9.0f}{s['p99_ms']:>9.0f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Compare artisan serve and Octane under concurrent load")
+    p.add_argument("--modes", default="serve,octane", help="comma-separated: serve, serve-multi, octane")
+    p.add_argument("--backend-dir", default=os.path.join(ROOT, "backend"))
+    p.add_argument("--php", default=shutil.which("php") or "php")
+    p.add_argument("--port", type=int, default=8100)
+    p.add_argument("--workers", type=int, default=4, help="worker count for serve-multi and octane")
+    p.add_argument("--octane-server", default="frankenphp", help="frankenphp, roadrunner or swoole")
+    p.add_argument("--max-requests", type=int, default=1000, help="Octane worker recycling")
+    p.add_argument("--stub-port", type=int, default=8788)
+    p.add_argument("--llm-ttfb-ms", type=int, default=400)
+    p.add_argument("--llm-latency-ms", type=int, default=4000)
+    p.add_argument("--users", type=int, default=20)
+    p.add_argument("--duration", type=float, default=30.0)
+    p.add_argument("--mix", default=loadgen.DEFAULT_MIX)
+    p.add_argument("--startup-timeout", type=float, default=60.0)
+    p.add_argument("--log-dir", default=None, help="keep each backend's stdout/stderr here")
+    p.add_argument("--json", dest="json_out", default=None)
+    args = p.parse_args(argv)
+
+    stub = start_stub(args)
+    results = []
+    try:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            print(f"[serve-bench] {mode}: {args.users} users for {args.duration:.0f}s", file=sys.stderr)
+            results.append(bench_mode(mode, args))
+    finally:
+        stub.shutdown()
+    print(format_comparison(results))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"results written to {args.json_out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
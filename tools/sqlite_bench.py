@@ -0,0 +1,225 @@
+"""SQLite storage benchmark: default pragmas vs the tuned backend settings, and
+database size before/after `php artisan sessions:compact`.
+
+Mirrors the backend's write pattern (one autocommit INSERT per API request, several
+PHP workers writing concurrently) on the real table layout, so the numbers track what
+`config/database.php` changes buy without needing PHP installed:
+
+    python tools/sqlite_bench.py --writers 8 --seconds 10 --sessions 200 --chunks 400
+"""
+import argparse
+import gzip
+import json
+import math
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+SCHEMA = """
+CREATE TABLE transcript_chunks (id integer primary key autoincrement not null, session_id varchar not null,
+    text text not null, source varchar, created_at datetime, updated_at datetime);
+CREATE INDEX transcript_chunks_session_id_index on transcript_chunks (session_id);
+CREATE TABLE qa_entries (id integer primary key autoincrement not null, session_id varchar not null,
+    persona_id integer, question text not null, ai_answer text not null, final_answer text,
+    created_at datetime, updated_at datetime);
+CREATE INDEX qa_entries_session_id_index on qa_entries (session_id);
+CREATE INDEX qa_entries_persona_id_index on qa_entries (persona_id);
+CREATE TABLE session_archives (id integer primary key autoincrement not null, session_id varchar not null,
+    kind varchar not null, row_count integer not null default 0, first_at datetime, last_at datetime,
+    payload blob not null, created_at datetime, updated_at datetime);
+CREATE INDEX session_archives_session_id_kind_index on session_archives (session_id, kind);
+"""
+
+PROFILES = {
+    # Laravel with null pragmas: rollback journal, FULL sync, PDO's 60 s default timeout
+    "default": {"journal_mode": "delete", "synchronous": "full", "busy_timeout": 60000, "mmap_size": 0},
+    # backend/config/database.php defaults
+    "tuned": {"journal_mode": "wal", "synchronous": "normal", "busy_timeout": 5000, "mmap_size": 268435456},
+}
+
+WORDS = ("the interviewer asked about distributed systems caching latency budgets and how we "
+         "measured success across releases while keeping the on-call load reasonable").split()
+
+
+def connect(path: str, profile: Dict) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=profile["busy_timeout"] / 1000.0, isolation_level=None,
+                           check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+    conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    return conn
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    v = sorted(values)
+    return v[max(0, min(len(v) - 1, math.ceil(pct / 100.0 * len(v)) - 1))]
+
+
+def bench_writes(profile_name: str, args: argparse.Namespace) -> Dict:
+    profile = PROFILES[profile_name]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite")
+        setup = connect(path, profile)
+        setup.executescript(SCHEMA)
+        setup.close()
+
+        latencies: List[float] = []
+        read_latencies: List[float] = []
+        errors = [0]
+        lock = threading.Lock()
+        stop_at = time.monotonic() + args.seconds
+
+        def writer(idx: int) -> None:
+            rng = random.Random(idx)
+            conn = connect(path, profile)
+            sid = f"bench-{idx % max(1, args.writers // 2)}"
+            local: List[float] = []
+            while time.monotonic() < stop_at:
+                now = time.strftime("%Y-%m-%d %H:%M:%S")
+                t0 = time.perf_counter()
+                try:
+                    if rng.random() < 0.15:
+                        # generate(): one qa_entries row with a long answer
+                        conn.execute(
+                            "INSERT INTO qa_entries (session_id, persona_id, question, ai_answer, created_at, updated_at)"
+                            " VALUES (?, ?, ?, ?, ?, ?)",
+                            (sid, 1, sentence(rng, 20), sentence(rng, 250), now, now))
+                    else:
+                        # storeTranscript(): one small transcript_chunks row
+                        conn.execute(
+                            "INSERT INTO transcript_chunks (session_id, text, source, created_at, updated_at)"
+                            " VALUES (?, ?, ?, ?, ?)",
+                            (sid, sentence(rng, 12), "system", now, now))
+                    local.append(time.perf_counter() - t0)
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+            conn.close()
+            with lock:
+                latencies.extend(local)
+
+        def reader() -> None:
+            conn = connect(path, profile)
+            local: List[float] = []
+            while time.monotonic() < stop_at:
+                t0 = time.perf_counter()
+                try:
+                    # generate()'s exact-match cache lookup
+                    conn.execute("SELECT * FROM qa_entries WHERE session_id = ? AND question = ? AND persona_id = ?"
+                                 " ORDER BY id DESC LIMIT 1", ("bench-0", "nope", 1)).fetchall()
+                    local.append(time.perf_counter() - t0)
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+                time.sleep(0.002)
+            conn.close()
+            with lock:
+                read_latencies.extend(local)
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+        threads.append(threading.Thread(target=reader))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    return {
+        "profile": profile_name,
+        "writes": len(latencies),
+        "writes_per_s": len(latencies) / args.seconds,
+        "write_p50_ms": percentile(latencies, 50) * 1000,
+        "write_p95_ms": percentile(latencies, 95) * 1000,
+        "write_p99_ms": percentile(latencies, 99) * 1000,
+        "read_p95_ms": percentile(read_latencies, 95) * 1000,
+        "errors": errors[0],
+    }
+
+
+def db_size(path: str) -> int:
+    return sum(os.path.getsize(path + s) for s in ("", "-wal", "-shm") if os.path.exists(path + s))
+
+
+def bench_compaction(args: argparse.Namespace) -> Dict:
+    """Populate finished sessions, then replay what sessions:compact does (plus VACUUM)."""
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "compact.sqlite")
+        conn = connect(path, PROFILES["tuned"])
+        conn.executescript(SCHEMA)
+        conn.execute("BEGIN")
+        for s in range(args.sessions):
+            sid = f"session-{s}"
+            for c in range(args.chunks):
+                ts = f"2025-08-{1 + s % 28:02d} 10:{(c // 60) % 60:02d}:{c % 60:02d}"
+                conn.execute("INSERT INTO transcript_chunks (session_id, text, source, created_at, updated_at)"
+                             " VALUES (?, ?, 'system', ?, ?)", (sid, sentence(rng, rng.randint(4, 16)), ts, ts))
+        conn.execute("COMMIT")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        before = db_size(path)
+        rows_before = conn.execute("SELECT COUNT(*) FROM transcript_chunks").fetchone()[0]
+
+        t0 = time.perf_counter()
+        sids = [r[0] for r in conn.execute("SELECT session_id FROM transcript_chunks GROUP BY session_id")]
+        for sid in sids:
+            conn.execute("BEGIN")
+            rows = conn.execute("SELECT id, text, source, created_at FROM transcript_chunks WHERE session_id = ?"
+                                " ORDER BY id", (sid,)).fetchall()
+            payload = "".join(json.dumps({"text": t, "source": src, "created_at": ts}) + "\n"
+                              for _, t, src, ts in rows)
+            conn.execute("INSERT INTO session_archives (session_id, kind, row_count, first_at, last_at, payload)"
+                         " VALUES (?, 'transcript', ?, ?, ?, ?)",
+                         (sid, len(rows), rows[0][3], rows[-1][3], gzip.compress(payload.encode(), 6)))
+            conn.execute("DELETE FROM transcript_chunks WHERE session_id = ? AND id <= ?", (sid, rows[-1][0]))
+            conn.execute("COMMIT")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        elapsed = time.perf_counter() - t0
+        after = db_size(path)
+        conn.close()
+
+    return {
+        "sessions": args.sessions,
+        "chunks": rows_before,
+        "size_before_mb": before / 1048576,
+        "size_after_mb": after / 1048576,
+        "compact_s": elapsed,
+    }
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="SQLite pragma + compaction benchmark")
+    p.add_argument("--writers", type=int, default=8, help="concurrent writer connections (PHP workers)")
+    p.add_argument("--seconds", type=float, default=10.0, help="duration of each write run")
+    p.add_argument("--sessions", type=int, default=200, help="finished sessions for the compaction run")
+    p.add_argument("--chunks", type=int, default=400, help="transcript chunks per session")
+    p.add_argument("--json", dest="json_out", default=None)
+    args = p.parse_args(argv)
+
+    results = {"writes": [bench_writes(name, args) for name in PROFILES], "compaction": bench_compaction(args)}
+
+    print(f"Concurrent writes ({args.writers} writers + 1 reader, {args.seconds:.0f}s each)")
+    print(f"{'profile':<10}{'writes/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'read p95':>10}{'errors':>8}")
+    for r in results["writes"]:
+        print(f"{r['profile']:<10}{r['writes_per_s']:>10.0f}{r['write_p50_ms']:>9.2f}{r['write_p95_ms']:>9.2f}"
+              f"{r['write_p99_ms']:>9.2f}{r['read_p95_ms']:>10.2f}{r['errors']:>8}")
+    c = results["compaction"]
+    print(f"\nCompaction ({c['sessions']} sessions, {c['chunks']} chunks): "
+          f"{c['size_before_mb']:.2f} MB -> {c['size_after_mb']:.2f} MB in {c['compact_s']:.2f}s")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()